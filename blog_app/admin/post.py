@@ -1,14 +1,27 @@
+import logging
+import os
+
+from django.conf import settings
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Exists, OuterRef
 from django.urls import path, reverse, NoReverseMatch
 from django.utils.html import format_html
 from django.shortcuts import get_object_or_404, redirect
-from django.middleware.csrf import get_token
+from django.template.response import TemplateResponse
 
 from blog_app.admin.base_admin import BaseAdmin
+from blog_app.cache import bump_page_generation, forget_recent_post_cards, forget_tag_cloud
+from blog_app.middleware import request_stats, reset_request_stats
 from blog_app.models import Post, Like, Comment
+from blog_app.templatetags.post_cards import STATS_FLUSH_EVERY, card_cache_stats
+from config.db_pool import db_pool_stats
 from taggit.models import TaggedItem
 
 
+logger = logging.getLogger(__name__)
+
+
 class CommentInline(admin.TabularInline):
     model = Comment
     fields = ('user', 'content', 'created_at', 'updated_at')
@@ -21,6 +34,12 @@ class CommentInline(admin.TabularInline):
         return qs.select_related('user')
 
 
+class PostChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # Rows only show stats; the post bodies are the widest columns in the table.
+        return super().get_queryset(request, exclude_parameters).defer('content', 'rendered_html')
+
+
 @admin.register(Post)
 class PostAdmin(BaseAdmin):
     list_display = ('title', 'author', 'status', 'created_at', 'updated_at', 'word_count', 'like_count', 'comment_count', 'current_admin_like_status')
@@ -32,8 +51,9 @@ class PostAdmin(BaseAdmin):
     ordering = ('-created_at',)
     
     list_select_related = ('author',)
+    show_full_result_count = False
 
-    readonly_fields_base = ['created_at', 'updated_at', 'like_count', 'comment_count', 'word_count'] 
+    readonly_fields = ('created_at', 'updated_at', 'like_count', 'comment_count', 'word_count', 'admin_like_button')
 
     fieldsets = (
         (None, {
@@ -59,54 +79,28 @@ class PostAdmin(BaseAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('author').prefetch_related('tags', 'likes', 'comments')
-
-    def word_count(self, obj):
-        return len(obj.content.split()) if obj.content else 0
-    word_count.short_description = 'Word Count'
-
-    def like_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'likes' in obj._prefetched_objects_cache:
-            return len(obj._prefetched_objects_cache['likes'])
-        if obj.pk: 
-            return obj.likes.count()
-        return 0
-    like_count.short_description = 'Likes'
-    like_count.admin_order_field = 'likes__count'
-
-    def comment_count(self, obj):
-        if hasattr(obj, '_prefetched_objects_cache') and 'comments' in obj._prefetched_objects_cache:
-            return len(obj._prefetched_objects_cache['comments'])
-        if obj.pk: 
-            return obj.comments.count()
-        return 0
-    comment_count.short_description = 'Comments'
-    comment_count.admin_order_field = 'comments__count'
+        return qs.select_related('author').defer('search_vector').annotate(
+            liked_by_you=Exists(Like.objects.filter(post=OuterRef('pk'), user=request.user))
+        )
+
+    def get_changelist(self, request, **kwargs):
+        # Not in get_queryset: the change form edits content, and a post saved
+        # with it deferred would be re-rendered as if its text had changed.
+        return PostChangeList
 
     def current_admin_like_status(self, obj):
-        request_user = getattr(self, 'request_user', getattr(self, 'current_user', None))
-        if obj.pk and request_user and request_user.is_authenticated:
-            if Like.objects.filter(post=obj, user=request_user).exists():
-                return "Liked by You"
-            return "Not Liked by You"
-        return "N/A (Save post first)"
+        if not obj.pk:
+            return "N/A (Save post first)"
+        return "Liked by You" if obj.liked_by_you else "Not Liked by You"
     current_admin_like_status.short_description = 'Your Like Status'
+    current_admin_like_status.admin_order_field = 'liked_by_you'
 
     def admin_like_button(self, obj):
         if not obj.pk:
             return format_html('<button type="button" class="button" disabled>Like this Post</button>   (Save post to enable liking)')
 
-        admin_user = getattr(self, 'request_user', None)
-        csrf_token = getattr(self, 'csrf_token_value', '')
+        button_text = "Unlike this Post" if getattr(obj, 'liked_by_you', False) else "Like this Post"
 
-        if not admin_user or not admin_user.is_authenticated:
-             return "User context unavailable"
-        if not csrf_token:
-            return "CSRF token unavailable"
-
-        is_liked_by_admin = Like.objects.filter(post=obj, user=admin_user).exists()
-        button_text = "Unlike this Post" if is_liked_by_admin else "Like this Post"
-        
         admin_site_name = self.admin_site.name
         app_label = self.model._meta.app_label
         model_name = self.model._meta.model_name
@@ -120,8 +114,8 @@ class PostAdmin(BaseAdmin):
 
         button_id = f"toggle-like-button-{obj.pk}"
         html_button = format_html(
-            '<button type="button" id="{}" data-action-url="{}" data-csrf-token="{}" class="button">{}</button>',
-            button_id, action_url, csrf_token, button_text
+            '<button type="button" id="{}" data-action-url="{}" class="button">{}</button>',
+            button_id, action_url, button_text
         )
         js_script = format_html(
             '''<script>
@@ -131,13 +125,14 @@ class PostAdmin(BaseAdmin):
                     button.setAttribute('listener-attached', 'true');
                     button.addEventListener('click', function(e) {{
                         e.preventDefault();
+                        var pageToken = document.querySelector('input[name="csrfmiddlewaretoken"]');
                         var form = document.createElement('form');
                         form.method = 'POST';
                         form.action = this.getAttribute('data-action-url');
                         var csrfInput = document.createElement('input');
                         csrfInput.type = 'hidden';
                         csrfInput.name = 'csrfmiddlewaretoken';
-                        csrfInput.value = this.getAttribute('data-csrf-token');
+                        csrfInput.value = pageToken ? pageToken.value : '';
                         form.appendChild(csrfInput);
                         document.body.appendChild(form);
                         form.submit();
@@ -156,6 +151,21 @@ class PostAdmin(BaseAdmin):
         opts = self.model._meta
         url_pattern_name = f'{opts.app_label}_{opts.model_name}_toggle_like'
         custom_urls = [
+            path(
+                'card-cache-stats/',
+                self.admin_site.admin_view(self.card_cache_stats_view),
+                name=f'{opts.app_label}_{opts.model_name}_card_cache_stats'
+            ),
+            path(
+                'request-stats/',
+                self.admin_site.admin_view(self.request_stats_view),
+                name=f'{opts.app_label}_{opts.model_name}_request_stats'
+            ),
+            path(
+                'db-pool-stats/',
+                self.admin_site.admin_view(self.db_pool_stats_view),
+                name=f'{opts.app_label}_{opts.model_name}_db_pool_stats'
+            ),
             path(
                 '<path:object_id>/toggle-like/',
                 self.admin_site.admin_view(self.process_toggle_like),
@@ -189,47 +199,67 @@ class PostAdmin(BaseAdmin):
         redirect_url = reverse(change_url_name, args=[post.pk])
         return redirect(redirect_url)
 
-    def render_change_form(self, request, context, add=False, change=False, form_url='', obj=None):
-        self.request_user = request.user
-        self.csrf_token_value = get_token(request)
-        return super().render_change_form(request, context, add, change, form_url, obj)
-
-    def get_readonly_fields(self, request, obj=None):
-        self.request_user = request.user
-        ro_fields = list(self.readonly_fields_base) 
-        if 'admin_like_button' not in ro_fields:
-            ro_fields.append('admin_like_button')
-        return tuple(ro_fields)
-
-    def changelist_view(self, request, extra_context=None):
-        self.current_user = request.user
-        self.request_user = request.user
-        return super().changelist_view(request, extra_context)
-            
+    def card_cache_stats_view(self, request):
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Post card cache',
+            'flush_every': STATS_FLUSH_EVERY,
+            'stats': card_cache_stats(),
+        }
+        return TemplateResponse(request, 'admin/blog_app/post/card_cache_stats.html', context)
+
+    def request_stats_view(self, request):
+        if request.method == 'POST':
+            reset_request_stats()
+            messages.success(request, "Request stats have been reset.")
+            return redirect('admin:blog_app_post_request_stats')
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Request stats',
+            'profiling_enabled': settings.BLOG_REQUEST_PROFILING,
+            'sample_rate': settings.BLOG_REQUEST_PROFILING_SAMPLE_RATE,
+            'stats': request_stats(),
+        }
+        return TemplateResponse(request, 'admin/blog_app/post/request_stats.html', context)
+
+    def db_pool_stats_view(self, request):
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Database pool stats',
+            'pool_enabled': settings.BLOG_DB_POOL,
+            'pid': os.getpid(),
+            'stats': db_pool_stats(),
+        }
+        return TemplateResponse(request, 'admin/blog_app/post/db_pool_stats.html', context)
+
+    bulk_action_chunk_size = 500
+
     actions = ['publish_posts', 'archive_posts', 'draft_posts', 'admin_like_posts_bulk', 'admin_unlike_posts_bulk']
 
     def publish_posts(self, request, queryset):
-        updated_count = queryset.update(status=Post.STATUS_PUBLISHED)
+        updated_count = self._set_status(queryset, Post.STATUS_PUBLISHED)
         self.message_user(request, f"{updated_count} post(s) have been published.", messages.SUCCESS)
     publish_posts.short_description = "Mark selected posts as Published"
 
     def archive_posts(self, request, queryset):
-        updated_count = queryset.update(status=Post.STATUS_ARCHIVED)
+        updated_count = self._set_status(queryset, Post.STATUS_ARCHIVED)
         self.message_user(request, f"{updated_count} post(s) have been archived.", messages.SUCCESS)
     archive_posts.short_description = "Mark selected posts as Archived"
 
     def draft_posts(self, request, queryset):
-        updated_count = queryset.update(status=Post.STATUS_DRAFTED)
+        updated_count = self._set_status(queryset, Post.STATUS_DRAFTED)
         self.message_user(request, f"{updated_count} post(s) have been drafted.", messages.SUCCESS)
     draft_posts.short_description = "Mark selected posts as Drafted"
 
     def admin_like_posts_bulk(self, request, queryset):
-        admin_user = request.user
-        liked_count = 0; already_liked_count = 0
-        for post_obj in queryset:
-            _, created = Like.objects.get_or_create(post=post_obj, user=admin_user)
-            if created: liked_count += 1
-            else: already_liked_count +=1
+        selected_count = 0; liked_count = 0
+        for post_ids in self._selected_id_chunks(queryset, 'like'):
+            selected_count += len(post_ids)
+            liked_count += Like.objects.like_posts(post_ids, request.user)
+        already_liked_count = selected_count - liked_count
         msg_parts = []
         if liked_count: msg_parts.append(f"{liked_count} post(s) liked.")
         if already_liked_count: msg_parts.append(f"{already_liked_count} post(s) already liked by you.")
@@ -238,12 +268,11 @@ class PostAdmin(BaseAdmin):
     admin_like_posts_bulk.short_description = "Like selected (as admin)"
 
     def admin_unlike_posts_bulk(self, request, queryset):
-        admin_user = request.user
-        unliked_count = 0; not_liked_count = 0
-        for post_obj in queryset:
-            deleted_count, _ = Like.objects.filter(post=post_obj, user=admin_user).delete()
-            if deleted_count > 0: unliked_count +=1
-            else: not_liked_count += 1
+        selected_count = 0; unliked_count = 0
+        for post_ids in self._selected_id_chunks(queryset, 'unlike'):
+            selected_count += len(post_ids)
+            unliked_count += Like.objects.unlike_posts(post_ids, request.user)
+        not_liked_count = selected_count - unliked_count
         msg_parts = []
         if unliked_count: msg_parts.append(f"{unliked_count} post(s) unliked.")
         if not_liked_count: msg_parts.append(f"{not_liked_count} post(s) were not liked by you.")
@@ -251,6 +280,24 @@ class PostAdmin(BaseAdmin):
         self.message_user(request, " ".join(msg_parts), messages.SUCCESS if unliked_count > 0 else messages.INFO)
     admin_unlike_posts_bulk.short_description = "Unlike selected (as admin)"
 
+    def _set_status(self, queryset, status):
+        updated_count = 0
+        for post_ids in self._selected_id_chunks(queryset, f'set status {status}'):
+            updated_count += Post.objects.filter(pk__in=post_ids).update(status=status)
+            forget_recent_post_cards(post_ids)
+        bump_page_generation()
+        forget_tag_cloud()
+        return updated_count
+
+    def _selected_id_chunks(self, queryset, action):
+        # "Select all" can cover the whole table, so selections are walked in
+        # primary key order and handled one chunk (and transaction) at a time.
+        processed = 0
+        for post_ids in queryset.pk_batches(self.bulk_action_chunk_size):
+            yield post_ids
+            processed += len(post_ids)
+            logger.info('Admin bulk %s: processed %d post(s)', action, processed)
+
 
 @admin.register(Like)
 class LikeAdmin(BaseAdmin):
@@ -1,8 +1,12 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
 from blog_app.admin.base_admin import BaseAdmin
-from blog_app.models import CustomUser
+from blog_app.cache import forget_recent_post_cards
+from blog_app.models import CustomUser, Post
 from blog_app.forms.user import UserRegistration, UserProfile
+from blog_app.images import schedule_profile_thumbnails
 
 @admin.register(CustomUser)
 class CustomUserAdmin(BaseUserAdmin, BaseAdmin):
@@ -26,9 +30,23 @@ class CustomUserAdmin(BaseUserAdmin, BaseAdmin):
     
     readonly_fields = BaseUserAdmin.readonly_fields + ('post_count',)
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'profile_image' in form.changed_data:
+            schedule_profile_thumbnails(obj)
+        if change and 'username' in form.changed_data:
+            # Recently viewed cards carry the author's username for their links.
+            post_ids = list(Post.objects.filter(author=obj).values_list('pk', flat=True))
+            transaction.on_commit(lambda: forget_recent_post_cards(post_ids))
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(post_total=Count('post'))
+
     def post_count(self, obj):
-        return obj.post_set.count()
+        return obj.post_total
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = 'post_total'
 
     # actions = ['activate_users', 'deactivate_users']
 
@@ -0,0 +1,295 @@
+"""
+Per-view performance benchmarks.
+
+Run with ``python manage.py test blog_app.benchmarks``. The read views in
+blog_app/urls.py, the like and comment writes and the admin changelists are
+driven in-process against a fixed, seeded dataset; the form views (create,
+edit, signup, login, contact, edit_profile) are not covered. p50/p95
+latency, SQL query counts and bytes rendered are written as JSON to
+BLOG_BENCHMARK_OUTPUT (default var/benchmarks/benchmark_results.json), and
+the run fails when a view issues more queries than its budget in
+benchmark_budgets.json.
+
+AsyncThroughputBenchmarkTests is a model, not a server measurement: it
+drives Django's WSGI and ASGI handlers in-process, and stands in for slow
+clients with a client_delay_ms wait after each response. The sync views hold
+one of a fixed pool of worker threads for that wait, as a threaded WSGI
+server would; the async views only await it. Real uvicorn or gunicorn
+workers, sockets and the event loop's own overhead are not part of it, so
+read its numbers as the shape of the difference, not as requests per second
+a deployment will reach. Results go to BLOG_BENCHMARK_THROUGHPUT_OUTPUT
+(default var/benchmarks/benchmark_throughput.json).
+"""
+import asyncio
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog_app.models import CustomUser, Post
+from blog_app.urls import AsyncViewsURLConf
+from taggit.models import Tag
+
+
+BUDGETS_PATH = Path(__file__).resolve().parent / 'benchmark_budgets.json'
+RESULTS_DIR = settings.BASE_DIR / 'var' / 'benchmarks'
+DATASET = {'seed': 2025, 'users': 60, 'posts': 400, 'tags': 40, 'likes_per_post': 15.0, 'comments_per_post': 8.0}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False, BLOG_CARD_CACHE_ENABLED=False)
+class ViewBenchmarkTests(TestCase):
+    iterations = int(os.environ.get('BLOG_BENCHMARK_ITERATIONS', 20))
+    output_path = Path(os.environ.get('BLOG_BENCHMARK_OUTPUT', RESULTS_DIR / 'benchmark_results.json'))
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_fake_data', prefix='bench', stdout=StringIO(), **DATASET)
+
+        cls.reader = CustomUser.objects.get(username='bench_user0')
+        cls.reader.user_permissions.add(Permission.objects.get(codename='create_comment', content_type__model='comment'))
+        cls.admin = CustomUser.objects.create_superuser(username='bench_admin', email='admin@example.com', password='pw')
+
+        published = Post.objects.filter(status=Post.STATUS_PUBLISHED).select_related('author')
+        cls.popular_post = published.order_by('-comment_count', '-like_count').first()
+        cls.profile_user = cls.popular_post.author
+        cls.tag = Tag.objects.order_by('pk').first()
+
+    def scenarios(self):
+        post = self.popular_post
+        detail_args = [post.author.username, post.slug]
+        return [
+            ('post_list', None, 'get', reverse('blog_app:post_list'), {}),
+            ('post_list_authenticated', self.reader, 'get', reverse('blog_app:post_list'), {}),
+            ('post_detail', self.reader, 'get', reverse('blog_app:post_detail', args=detail_args), {}),
+            ('post_comments', self.reader, 'get', reverse('blog_app:post_comments', args=detail_args), {}),
+            ('search_results', None, 'get', reverse('blog_app:search_results'), {'q': 'lorem'}),
+            ('tag_posts', None, 'get', reverse('blog_app:tag_posts', args=[self.tag.slug]), {}),
+            ('user_profile', None, 'get', reverse('blog_app:user_profile', args=[self.profile_user.username]), {}),
+            ('like_post', self.reader, 'post', reverse('blog_app:like_post', args=detail_args), {}),
+            ('add_comment', self.reader, 'post', reverse('blog_app:add_comment', args=[post.slug]),
+             {'content': 'Benchmark comment.'}),
+            ('admin_post_changelist', self.admin, 'get', reverse('admin:blog_app_post_changelist'), {}),
+            ('admin_like_changelist', self.admin, 'get', reverse('admin:blog_app_like_changelist'), {}),
+            ('admin_comment_changelist', self.admin, 'get', reverse('admin:blog_app_comment_changelist'), {}),
+            ('admin_user_changelist', self.admin, 'get', reverse('admin:blog_app_customuser_changelist'), {}),
+        ]
+
+    def measure(self, user, method, url, data):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        request = getattr(client, method)
+
+        request(url, data)
+        latencies, query_counts, sizes = [], [], []
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = request(url, data)
+                latencies.append((time.perf_counter() - started) * 1000)
+            self.assertLess(response.status_code, 400, f'{method.upper()} {url} returned {response.status_code}')
+            query_counts.append(len(ctx.captured_queries))
+            sizes.append(len(response.content))
+
+        return {
+            'url': url,
+            'method': method.upper(),
+            'iterations': self.iterations,
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'queries': max(query_counts),
+            'bytes': max(sizes),
+        }
+
+    def test_views_stay_within_query_budgets(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        results = {name: self.measure(user, method, url, data) for name, user, method, url, data in self.scenarios()}
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_path.write_text(json.dumps({'dataset': DATASET, 'views': results}, indent=2))
+
+        for name, result in results.items():
+            with self.subTest(view=name):
+                self.assertIn(name, budgets, f'No query budget for {name} in {BUDGETS_PATH.name}.')
+                self.assertLessEqual(
+                    result['queries'], budgets[name],
+                    f"{name} ran {result['queries']} queries, budget is {budgets[name]}.",
+                )
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False, BLOG_CARD_CACHE_ENABLED=False)
+class AsyncThroughputBenchmarkTests(TransactionTestCase):
+    """
+    Models slow clients against in-process handlers (see the module
+    docstring): every client waits client_delay_ms before it has read a
+    response. A sync worker thread is held for that time, like behind a
+    threaded WSGI server; the ASGI handler only awaits it.
+    """
+    concurrency = int(os.environ.get('BLOG_BENCHMARK_CONCURRENCY', 50))
+    requests_per_view = int(os.environ.get('BLOG_BENCHMARK_REQUESTS', 200))
+    sync_threads = int(os.environ.get('BLOG_BENCHMARK_SYNC_THREADS', 8))
+    client_delay_ms = float(os.environ.get('BLOG_BENCHMARK_CLIENT_DELAY_MS', 250))
+    output_path = Path(os.environ.get(
+        'BLOG_BENCHMARK_THROUGHPUT_OUTPUT', RESULTS_DIR / 'benchmark_throughput.json'
+    ))
+
+    def setUp(self):
+        call_command('generate_fake_data', prefix='bench', stdout=StringIO(), **DATASET)
+
+        reader = CustomUser.objects.get(username='bench_user0')
+        client = Client()
+        client.force_login(reader)
+        self.session_cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        published = Post.objects.filter(status=Post.STATUS_PUBLISHED).select_related('author')
+        self.post = published.order_by('-comment_count', '-like_count').first()
+        self.tag = Tag.objects.order_by('pk').first()
+
+    def scenarios(self):
+        post = self.post
+        return [
+            ('post_list', reverse('blog_app:post_list'), {}, ''),
+            ('post_detail', reverse('blog_app:post_detail', args=[post.author.username, post.slug]), {},
+             self.session_cookie),
+            ('search_results', reverse('blog_app:search_results'), {'q': 'lorem'}, ''),
+            ('tag_posts', reverse('blog_app:tag_posts', args=[self.tag.slug]), {}, ''),
+            ('user_profile', reverse('blog_app:user_profile', args=[post.author.username]), {}, ''),
+        ]
+
+    def run_sync(self, url, query, cookie):
+        handler = WSGIHandler()
+        delay = self.client_delay_ms / 1000
+
+        def handle():
+            environ = {'PATH_INFO': url, 'QUERY_STRING': query, 'HTTP_HOST': 'localhost', 'HTTP_COOKIE': cookie}
+            setup_testing_defaults(environ)
+            statuses = []
+            body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+            try:
+                b''.join(body)
+                time.sleep(delay)
+            finally:
+                body.close()
+            return int(statuses[0].split()[0])
+
+        with ThreadPoolExecutor(self.sync_threads) as workers, ThreadPoolExecutor(self.concurrency) as clients:
+            def client(count):
+                return [timed(lambda: workers.submit(handle).result()) for _ in range(count)]
+            started = time.perf_counter()
+            per_client = list(clients.map(client, self.request_counts()))
+            return self.collect(per_client, time.perf_counter() - started)
+
+    def run_async(self, url, query, cookie):
+        handler = ASGIHandler()
+        delay = self.client_delay_ms / 1000
+
+        async def handle():
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': url, 'raw_path': url.encode(), 'query_string': query.encode(),
+                'root_path': '', 'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+                'headers': [(b'host', b'localhost'), (b'cookie', cookie.encode())],
+            }
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            statuses = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # Nobody disconnects; the handler cancels this once it responds.
+                await asyncio.Future()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif not message.get('more_body'):
+                    await asyncio.sleep(delay)
+
+            await handler(scope, receive, send)
+            return statuses[0]
+
+        async def client(count):
+            results = []
+            for _ in range(count):
+                started = time.perf_counter()
+                status = await handle()
+                results.append((status, (time.perf_counter() - started) * 1000))
+            return results
+
+        async def run():
+            return await asyncio.gather(*(client(count) for count in self.request_counts()))
+
+        with override_settings(ROOT_URLCONF=AsyncViewsURLConf):
+            started = time.perf_counter()
+            per_client = asyncio.run(run())
+            return self.collect(per_client, time.perf_counter() - started)
+
+    def request_counts(self):
+        share, extra = divmod(self.requests_per_view, self.concurrency)
+        return [share + (1 if index < extra else 0) for index in range(self.concurrency)]
+
+    def collect(self, per_client, elapsed):
+        results = [result for client_results in per_client for result in client_results]
+        latencies = [latency for _, latency in results]
+        return {
+            'requests': len(results),
+            'errors': sum(1 for status, _ in results if status >= 400),
+            'requests_per_second': round(len(results) / elapsed, 1),
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+        }
+
+    def test_sync_and_async_read_view_throughput(self):
+        results = {}
+        for name, url, data, cookie in self.scenarios():
+            query = urlencode(data)
+            sync = self.run_sync(url, query, cookie)
+            async_ = self.run_async(url, query, cookie)
+            results[name] = {
+                'sync': sync,
+                'async': async_,
+                'speedup': round(async_['requests_per_second'] / sync['requests_per_second'], 2),
+            }
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_path.write_text(json.dumps({
+            'model': 'in-process WSGI/ASGI handlers, slow clients simulated with client_delay_ms',
+            'dataset': DATASET,
+            'concurrency': self.concurrency,
+            'requests_per_view': self.requests_per_view,
+            'sync_threads': self.sync_threads,
+            'client_delay_ms': self.client_delay_ms,
+            'views': results,
+        }, indent=2))
+
+        for name, result in results.items():
+            with self.subTest(view=name):
+                self.assertEqual(result['sync']['errors'], 0)
+                self.assertEqual(result['async']['errors'], 0)
+
+
+def timed(call):
+    started = time.perf_counter()
+    status = call()
+    return status, (time.perf_counter() - started) * 1000
@@ -0,0 +1,257 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.db.models import Count, F
+from django.http import HttpResponse
+
+from blog_app.views.utils import aload_user
+
+
+PAGE_GENERATION_KEY = 'page-cache:generation'
+CARD_GENERATION_KEY = 'post-card:generation'
+RECENT_CARD_KEY = 'recent-post-card:{pk}'
+TAG_CLOUD_KEY = 'tag-cloud'
+TAG_CLOUD_SIZE = 40
+TAG_CLOUD_WEIGHTS = 5
+
+
+def page_cache():
+    return caches[settings.BLOG_PAGE_CACHE_ALIAS]
+
+
+def page_generation():
+    return _generation(page_cache(), PAGE_GENERATION_KEY)
+
+
+def bump_page_generation():
+    _bump_generation(page_cache(), PAGE_GENERATION_KEY)
+
+
+def _generation(cache, key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, timeout=None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def _bump_generation(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 2, timeout=None)
+
+
+def page_cache_key(request):
+    query = '&'.join(sorted(request.GET.urlencode().split('&')))
+    url = f'{request.get_host()}{request.path}?{query}'
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f'page-cache:{page_generation()}:{digest}'
+
+
+def _has_pending_messages(request):
+    return len(get_messages(request)) > 0
+
+
+def _is_cacheable_request(request):
+    return (
+        settings.BLOG_PAGE_CACHE_ENABLED
+        and request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and not _has_pending_messages(request)
+    )
+
+
+def _is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        and not _has_pending_messages(request)
+    )
+
+
+def anonymous_page_cache(view_func):
+    """
+    Serve whole pages to anonymous GET requests from the page cache.
+
+    Entries are keyed on the current page generation, so any Post, Comment or
+    Like write (see bump_page_generation) retires every cached page at once.
+    Works on sync and async views.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            await aload_user(request)
+            if not _is_cacheable_request(request):
+                return await view_func(request, *args, **kwargs)
+
+            key, response = await sync_to_async(_cached_response)(request)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+                await sync_to_async(_store_response)(key, request, response)
+            return response
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        key, response = _cached_response(request)
+        if response is None:
+            response = view_func(request, *args, **kwargs)
+            _store_response(key, request, response)
+        return response
+    return wrapper
+
+
+def _cached_response(request):
+    key = page_cache_key(request)
+    cached = page_cache().get(key)
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'hit'
+    return key, response
+
+
+def _store_response(key, request, response):
+    if _is_cacheable_response(request, response):
+        page_cache().set(key, (response.content, response['Content-Type']), timeout=settings.BLOG_PAGE_CACHE_TIMEOUT)
+        response['X-Page-Cache'] = 'miss'
+
+
+def fragment_cache():
+    return caches[settings.BLOG_CARD_CACHE_ALIAS]
+
+
+def recent_post_cards(pks):
+    """
+    Return title, slug and author username for the given posts, in order.
+
+    Cards come from the fragment cache; misses are filled with one values()
+    query. Only published posts are returned.
+    """
+    cache = fragment_cache()
+    keys = {pk: RECENT_CARD_KEY.format(pk=pk) for pk in pks}
+    cached = cache.get_many(keys.values())
+    cards = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    missing = [pk for pk in pks if pk not in cards]
+    if missing:
+        fetched = {row['pk']: row for row in _recent_card_rows(missing)}
+        cache.set_many({keys[pk]: card for pk, card in fetched.items()}, timeout=settings.BLOG_CARD_CACHE_TIMEOUT)
+        cards.update(fetched)
+
+    return _published_cards(cards, pks)
+
+
+async def arecent_post_cards(pks):
+    cache = fragment_cache()
+    keys = {pk: RECENT_CARD_KEY.format(pk=pk) for pk in pks}
+    cached = await cache.aget_many(keys.values())
+    cards = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    missing = [pk for pk in pks if pk not in cards]
+    if missing:
+        fetched = {row['pk']: row async for row in _recent_card_rows(missing)}
+        await cache.aset_many({keys[pk]: card for pk, card in fetched.items()}, timeout=settings.BLOG_CARD_CACHE_TIMEOUT)
+        cards.update(fetched)
+
+    return _published_cards(cards, pks)
+
+
+def _recent_card_rows(pks):
+    from blog_app.models import Post
+
+    return Post.objects.filter(pk__in=pks) \
+        .values('pk', 'title', 'slug', 'status', author_username=F('author__username'))
+
+
+def _published_cards(cards, pks):
+    from blog_app.models import Post
+
+    return [cards[pk] for pk in pks if pk in cards and cards[pk]['status'] == Post.STATUS_PUBLISHED]
+
+
+def card_generation():
+    return _generation(fragment_cache(), CARD_GENERATION_KEY)
+
+
+def bump_card_generation():
+    """Retire every cached post card, for rewrites that leave updated_at alone."""
+    _bump_generation(fragment_cache(), CARD_GENERATION_KEY)
+
+
+def forget_recent_post_cards(pks):
+    fragment_cache().delete_many([RECENT_CARD_KEY.format(pk=pk) for pk in pks])
+
+
+def tag_cloud():
+    """
+    Return the most used tags with their published post counts, heaviest
+    first, each with a 1-5 weight for sizing.
+
+    The aggregate is cached and dropped by signals whenever tags or post
+    statuses change, so it runs once per change rather than once per request.
+    """
+    cache = fragment_cache()
+    cloud = cache.get(TAG_CLOUD_KEY)
+    if cloud is None:
+        cloud = _weighted_tag_cloud(list(_tag_cloud_rows(_post_content_type())))
+        cache.set(TAG_CLOUD_KEY, cloud, timeout=settings.BLOG_CARD_CACHE_TIMEOUT)
+    return cloud
+
+
+async def atag_cloud():
+    cache = fragment_cache()
+    cloud = await cache.aget(TAG_CLOUD_KEY)
+    if cloud is None:
+        content_type = await sync_to_async(_post_content_type)()
+        cloud = _weighted_tag_cloud([row async for row in _tag_cloud_rows(content_type)])
+        await cache.aset(TAG_CLOUD_KEY, cloud, timeout=settings.BLOG_CARD_CACHE_TIMEOUT)
+    return cloud
+
+
+def _post_content_type():
+    from django.contrib.contenttypes.models import ContentType
+
+    from blog_app.models import Post
+
+    return ContentType.objects.get_for_model(Post)
+
+
+def _tag_cloud_rows(content_type):
+    from taggit.models import TaggedItem
+
+    from blog_app.models import Post
+
+    published = Post.objects.filter(status=Post.STATUS_PUBLISHED).values('pk')
+    return TaggedItem.objects.filter(content_type=content_type, object_id__in=published) \
+        .values('tag__name', 'tag__slug') \
+        .annotate(count=Count('pk')) \
+        .order_by('-count', 'tag__name')[:TAG_CLOUD_SIZE]
+
+
+def _weighted_tag_cloud(rows):
+    heaviest = rows[0]['count'] if rows else 1
+    return [
+        {
+            'name': row['tag__name'],
+            'slug': row['tag__slug'],
+            'count': row['count'],
+            'weight': max(1, round(TAG_CLOUD_WEIGHTS * row['count'] / heaviest)),
+        }
+        for row in rows
+    ]
+
+
+def forget_tag_cloud():
+    fragment_cache().delete(TAG_CLOUD_KEY)
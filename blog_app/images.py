@@ -0,0 +1,116 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_IMAGE_SIZES = {
+    'thumb': (150, 150),
+    'small': (48, 48),
+}
+VARIANT_FORMATS = {
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+}
+THUMBNAIL_DIR = 'profile_thumbnails'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def image_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BLOG_IMAGE_WORKERS, thread_name_prefix='profile-images'
+            )
+    return _executor
+
+
+def schedule_profile_thumbnails(user):
+    """
+    Generate the profile image variants of user in a worker thread once the
+    current transaction commits. Until they exist, templates use the original.
+    Variants of a replaced image are deleted on commit.
+    """
+    source = user.profile_image.name
+    thumbnails = user.profile_thumbnails or {}
+    if thumbnails.get('source') != source:
+        stale = list(thumbnails.get('variants', {}).values())
+        if stale:
+            transaction.on_commit(lambda: _delete_variants(stale))
+    if not source:
+        return
+    transaction.on_commit(lambda: image_executor().submit(_generate_in_worker, user.pk, source))
+
+
+def _delete_variants(names):
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except OSError:
+            logger.warning('Could not delete profile image variant %s', name, exc_info=True)
+
+
+def _generate_in_worker(user_pk, source):
+    close_old_connections()
+    try:
+        generate_profile_thumbnails(user_pk, source)
+    except Exception:
+        logger.exception('Could not generate profile thumbnails for user %s from %s', user_pk, source)
+    finally:
+        close_old_connections()
+
+
+def generate_profile_thumbnails(user_pk, source):
+    from blog_app.models import CustomUser
+
+    with default_storage.open(source, 'rb') as original:
+        image = Image.open(original)
+        # Apply the EXIF orientation to the pixels; variants are saved without
+        # any of the original metadata.
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    stem = PurePosixPath(source).stem
+    variants = {}
+    for size_name, size in PROFILE_IMAGE_SIZES.items():
+        fitted = ImageOps.fit(image, size, method=Image.Resampling.LANCZOS)
+        for format_name, (pil_format, options) in VARIANT_FORMATS.items():
+            pixels = fitted.convert('RGB') if pil_format == 'JPEG' else fitted
+            buffer = BytesIO()
+            pixels.save(buffer, pil_format, **options)
+            name = f'{THUMBNAIL_DIR}/{user_pk}/{stem}-{size_name}.{format_name}'
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            variants[f'{size_name}_{format_name}'] = default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    # Only record the variants if the user still has the image they were made
+    # from; a newer upload schedules its own job.
+    CustomUser.objects.filter(pk=user_pk, profile_image=source).update(
+        profile_thumbnails={'source': source, 'variants': variants}
+    )
+    return variants
+
+
+def profile_image_variant_url(user, size_name, format_name='jpeg'):
+    if not user.profile_image:
+        return None
+    thumbnails = user.profile_thumbnails or {}
+    if thumbnails.get('source') == user.profile_image.name:
+        name = thumbnails.get('variants', {}).get(f'{size_name}_{format_name}')
+        if name:
+            return default_storage.url(name)
+    return None
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.cache import bump_card_generation, bump_page_generation
+from blog_app.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Compute the stored word count, reading time and excerpt of posts that are missing them, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--all', action='store_true', help='Recompute every post, not only the missing ones.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = Post.objects.all()
+        if not options['all']:
+            posts = posts.filter(excerpt_html='').exclude(content='')
+        total = 0
+
+        for pks in posts.pk_batches(batch_size):
+            total += Post.objects.filter(pk__in=pks).refresh_content_stats(batch_size)
+            self.stdout.write(f'Updated {total} post(s)...')
+
+        if total:
+            # bulk_update leaves updated_at alone, so cards and pages keyed on it would keep the old HTML.
+            bump_card_generation()
+            bump_page_generation()
+        self.stdout.write(self.style.SUCCESS(f'Done. Updated {total} post(s).'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.models import LikeEvent
+
+
+class Command(BaseCommand):
+    help = 'Fold pending LikeEvent rows into Post.like_count, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            folded = LikeEvent.objects.fold(batch_size=options['batch_size'])
+            if not folded:
+                break
+            total += folded
+            self.stdout.write(f'Folded {total} like event(s)...')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Folded {total} like event(s).'))
@@ -0,0 +1,360 @@
+import io
+import json
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import JSONField, Q
+from taggit.models import Tag, TaggedItem
+
+from blog_app.models import Comment, CustomUser, Like, LikeEvent, Post
+from blog_app.models.post import content_stats, rendered_content
+
+
+TITLE_PATTERNS = [
+    '{n} Ways to Improve Your {topic} Skills',
+    'Exploring the Wonders of {topic}',
+    'The Art of {topic}: Finding Inner Peace',
+    'The Ultimate Guide to {topic}',
+    'Top {n} Tips for {topic}',
+    'What Nobody Tells You About {topic}',
+    'A Beginner\'s Guide to {topic}',
+    'Why {topic} Matters More Than Ever',
+]
+TOPICS = [
+    'Photography', 'Nature', 'Mindfulness', 'Healthy Eating', 'Productivity', 'Django', 'PostgreSQL',
+    'Travel', 'Remote Work', 'Gardening', 'Running', 'Cooking', 'Design', 'Writing', 'Music', 'Python',
+    'Investing', 'Parenting', 'Open Source', 'Coffee', 'Climbing', 'Databases', 'Chess', 'Film',
+]
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore '
+    'et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip '
+    'ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla '
+    'pariatur excepteur sint occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim'
+).split()
+FIRST_NAMES = ['Elnora', 'Annamaria', 'Raff', 'Samson', 'Kristian', 'Mina', 'Omid', 'Sara', 'Leo', 'Ava']
+LAST_NAMES = ['Rahimi', 'Smith', 'Garcia', 'Kowalski', 'Nguyen', 'Haddad', 'Okafor', 'Larsen', 'Ito']
+STATUS_WEIGHTS = [(Post.STATUS_PUBLISHED, 75), (Post.STATUS_DRAFTED, 15), (Post.STATUS_ARCHIVED, 10)]
+HISTORY_END = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+PASSWORD = 'password'
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset (users, posts, tags, likes, comments) for load tests '
+        'and benchmarks. Writes with COPY on PostgreSQL and batched INSERTs elsewhere.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--likes-per-post', type=float, default=20.0,
+                            help='Mean likes per published post; popularity follows a Pareto tail.')
+        parser.add_argument('--comments-per-post', type=float, default=5.0,
+                            help='Mean comments per published post; follows the same popularity as likes.')
+        parser.add_argument('--skew', type=float, default=1.3,
+                            help='Pareto shape for popularity; lower values give a heavier tail.')
+        parser.add_argument('--days', type=int, default=3 * 365,
+                            help='Length of the generated history, ending on 2025-01-01.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Posts generated per write batch.')
+        parser.add_argument('--prefix', default='fake', help='Username prefix for generated users.')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete users (and their content) previously generated with the same prefix.')
+        parser.add_argument('--skip-search-vector', action='store_true',
+                            help='Leave Post.search_vector empty; refresh it later to save load time.')
+
+    def handle(self, *args, **options):
+        if options['skew'] <= 1:
+            raise CommandError('--skew must be greater than 1.')
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1.')
+
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.use_copy = connection.vendor == 'postgresql'
+        self.written = {}
+
+        prefix = options['prefix']
+        generated_users = CustomUser.objects.filter(username__startswith=f'{prefix}_')
+        if options['flush']:
+            self.flush(generated_users)
+        elif generated_users.exists():
+            raise CommandError(f"Users prefixed '{prefix}_' already exist. Use --flush or another --prefix.")
+
+        self.user_ids = self.write_users()
+        self.tag_ids = self.write_tags()
+        self.write_posts()
+        self.reset_sequences()
+        if not options['skip_search_vector']:
+            self.refresh_search_vectors()
+        if self.use_copy:
+            with connection.cursor() as cursor:
+                for model in (CustomUser, Post, Like, Comment, TaggedItem):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+        summary = ', '.join(f'{count} {name}' for name, count in self.written.items())
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {summary}.'))
+
+    def flush(self, users):
+        # Plain DELETE statements: going through the ORM would fire per-row counter signals.
+        posts = Post.objects.filter(author__in=users)
+        querysets = [
+            TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(Post), object_id__in=posts.values('pk')),
+            LikeEvent.objects.filter(post__in=posts),
+            Like.objects.filter(Q(post__in=posts) | Q(user__in=users)),
+            Comment.objects.filter(Q(post__in=posts) | Q(user__in=users)),
+            posts,
+            users,
+        ]
+        deleted = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            for queryset in querysets:
+                model = queryset.model
+                sql, params = queryset.values('pk').query.sql_with_params()
+                table = connection.ops.quote_name(model._meta.db_table)
+                pk_column = connection.ops.quote_name(model._meta.pk.column)
+                cursor.execute(f'DELETE FROM {table} WHERE {pk_column} IN ({sql})', params)
+                deleted += cursor.rowcount
+        self.stdout.write(f'Deleted {deleted} previously generated row(s).')
+
+    def write_users(self):
+        first_id = self.next_id(CustomUser)
+        password = make_password(PASSWORD, salt=f'seed{self.options["seed"]}')
+        history_start = HISTORY_END - timedelta(days=self.options['days'])
+        rows = []
+        for index in range(self.options['users']):
+            joined = history_start + timedelta(seconds=self.rng.randrange(self.options['days'] * 86400))
+            username = f'{self.options["prefix"]}_user{index}'
+            rows.append({
+                'id': first_id + index,
+                'password': password,
+                'username': username,
+                'first_name': self.rng.choice(FIRST_NAMES),
+                'last_name': self.rng.choice(LAST_NAMES),
+                'email': f'{username}@example.com',
+                'date_joined': joined,
+                'created_at': joined,
+                'updated_at': joined,
+                'bio': self.sentence(8, 30),
+            })
+        with transaction.atomic():
+            self.write_rows(CustomUser, rows)
+        return list(range(first_id, first_id + self.options['users']))
+
+    def write_tags(self):
+        names = [f'{self.rng.choice(TOPICS).lower().replace(" ", "-")}-{index}' for index in range(self.options['tags'])]
+        existing = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=name) for name in names if name not in existing],
+            ignore_conflicts=True,
+        )
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+        self.written['tags'] = len(tag_ids)
+        return [tag_ids[name] for name in names]
+
+    def write_posts(self):
+        total = self.options['posts']
+        batch_size = self.options['batch_size']
+        first_post_id = self.next_id(Post)
+        self.next_like_id = self.next_id(Like)
+        self.next_comment_id = self.next_id(Comment)
+        self.next_tagged_item_id = self.next_id(TaggedItem)
+        self.post_content_type_id = ContentType.objects.get_for_model(Post).id
+
+        author_weights = [self.rng.paretovariate(self.options['skew']) for _ in self.user_ids]
+        cum_weights = list(accumulate(author_weights))
+
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            authors = self.rng.choices(self.user_ids, cum_weights=cum_weights, k=stop - start)
+            posts, likes, comments, tagged_items = [], [], [], []
+            for index in range(start, stop):
+                post_id = first_post_id + index
+                post = self.build_post(post_id, authors[index - start], index, total)
+                posts.append(post)
+                tagged_items.extend(self.build_tagged_items(post_id))
+                if post.status == Post.STATUS_PUBLISHED:
+                    popularity = self.popularity()
+                    post_likes = self.build_likes(post, popularity)
+                    post_comments = self.build_comments(post, popularity)
+                    post.like_count = len(post_likes)
+                    post.comment_count = len(post_comments)
+                    likes.extend(post_likes)
+                    comments.extend(post_comments)
+
+            Post.detailed.assign_slugs(posts)
+            with transaction.atomic():
+                self.write_rows(Post, [self.model_row(post) for post in posts])
+                self.write_rows(TaggedItem, tagged_items)
+                self.write_rows(Like, likes)
+                self.write_rows(Comment, comments)
+            self.stdout.write(f'Wrote {stop}/{total} post(s)...')
+        self.post_id_range = (first_post_id, first_post_id + total)
+
+    def build_post(self, post_id, author_id, index, total):
+        created = self.history_point(index, total)
+        edited = created + timedelta(minutes=self.rng.randrange(0, 60 * 24 * 30)) if self.rng.random() < 0.2 else created
+        status = self.rng.choices(
+            [status for status, _ in STATUS_WEIGHTS], weights=[weight for _, weight in STATUS_WEIGHTS]
+        )[0]
+        title = self.rng.choice(TITLE_PATTERNS).format(n=self.rng.randint(3, 15), topic=self.rng.choice(TOPICS))
+        paragraphs = [self.sentence(40, 120) for _ in range(self.rng.randint(1, 6))]
+        content = '\n\n'.join(paragraphs)
+        return Post(
+            id=post_id,
+            title=title,
+            content=content,
+            **content_stats(content),
+            **rendered_content(content),
+            author_id=author_id,
+            status=status,
+            created_at=created,
+            updated_at=edited,
+        )
+
+    def build_tagged_items(self, post_id):
+        if not self.tag_ids:
+            return []
+        count = min(len(self.tag_ids), self.rng.choice([0, 1, 2, 2, 3, 3, 4]))
+        chosen = set()
+        while len(chosen) < count:
+            # Low tag indexes are much more popular than high ones.
+            chosen.add(self.tag_ids[min(int(self.rng.paretovariate(1.1)) - 1, len(self.tag_ids) - 1)])
+        rows = []
+        for tag_id in sorted(chosen):
+            rows.append({
+                'id': self.next_tagged_item_id,
+                'tag_id': tag_id,
+                'content_type_id': self.post_content_type_id,
+                'object_id': post_id,
+            })
+            self.next_tagged_item_id += 1
+        return rows
+
+    def build_likes(self, post, popularity):
+        count = min(len(self.user_ids), int(self.options['likes_per_post'] * popularity))
+        rows = []
+        for user_id in sorted(self.rng.sample(self.user_ids, count)):
+            liked_at = self.after(post.created_at)
+            rows.append({
+                'id': self.next_like_id,
+                'post_id': post.id,
+                'user_id': user_id,
+                'created_at': liked_at,
+                'updated_at': liked_at,
+            })
+            self.next_like_id += 1
+        return rows
+
+    def build_comments(self, post, popularity):
+        count = int(self.options['comments_per_post'] * popularity)
+        rows = []
+        for commented_at in sorted(self.after(post.created_at) for _ in range(count)):
+            rows.append({
+                'id': self.next_comment_id,
+                'post_id': post.id,
+                'user_id': self.rng.choice(self.user_ids),
+                'content': self.sentence(3, 40),
+                'created_at': commented_at,
+                'updated_at': commented_at,
+            })
+            self.next_comment_id += 1
+        return rows
+
+    def popularity(self):
+        # Pareto samples scaled to a mean of 1: most posts are quiet, a few go viral.
+        skew = self.options['skew']
+        return self.rng.paretovariate(skew) * (skew - 1) / skew
+
+    def history_point(self, index, total):
+        span = self.options['days'] * 86400
+        offset = span * index / max(total, 1) + self.rng.uniform(0, span / max(total, 1))
+        return HISTORY_END - timedelta(seconds=span - offset)
+
+    def after(self, moment):
+        latest = max(moment, HISTORY_END)
+        return moment + timedelta(seconds=self.rng.randrange(1, int((latest - moment).total_seconds()) + 86400))
+
+    def sentence(self, min_words, max_words):
+        words = self.rng.choices(WORDS, k=self.rng.randint(min_words, max_words))
+        return ' '.join(words).capitalize() + '.'
+
+    def model_row(self, obj):
+        return {field.attname: getattr(obj, field.attname) for field in obj._meta.concrete_fields}
+
+    def next_id(self, model):
+        last = model.objects.order_by('-pk').values_list('pk', flat=True).first()
+        return (last or 0) + 1
+
+    def write_rows(self, model, rows):
+        if not rows:
+            return
+        # Generated values are already plain Python values; only field defaults need preparing.
+        fields = model._meta.concrete_fields
+        defaults = {field.attname: prepared_default(field) for field in fields}
+        attnames = [field.attname for field in fields]
+        values = [[row[name] if name in row else defaults[name] for name in attnames] for row in rows]
+
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                self.copy_rows(cursor, f'COPY {table} ({columns}) FROM STDIN', values)
+            else:
+                placeholders = ', '.join(['%s'] * len(fields))
+                cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', values)
+
+        name = model._meta.verbose_name_plural
+        self.written[name] = self.written.get(name, 0) + len(rows)
+
+    def copy_rows(self, cursor, sql, values):
+        buffer = io.StringIO()
+        for row in values:
+            buffer.write('\t'.join(copy_literal(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'):
+            raw_cursor.copy_expert(sql, buffer)
+        else:
+            with raw_cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(no_style(), [CustomUser, Post, Like, Comment, TaggedItem])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def refresh_search_vectors(self):
+        first_id, end_id = self.post_id_range
+        batch_size = self.options['batch_size']
+        refreshed = 0
+        for start in range(first_id, end_id, batch_size):
+            refreshed += Post.detailed.filter(pk__gte=start, pk__lt=min(start + batch_size, end_id)).update_search_vector()
+        self.stdout.write(f'Refreshed search vectors for {refreshed} post(s).')
+
+
+def prepared_default(field):
+    # JSON defaults are passed as text: the driver's JSON adapter has no COPY form.
+    if isinstance(field, JSONField):
+        return json.dumps(field.get_default())
+    return field.get_db_prep_save(field.get_default(), connection)
+
+
+def copy_literal(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    text = str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
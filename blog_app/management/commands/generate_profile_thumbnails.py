@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.images import generate_profile_thumbnails
+from blog_app.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Generate the thumbnail and WebP variants of profile images that do not have them yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate variants for every profile image.')
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.exclude(profile_image='').exclude(profile_image__isnull=True) \
+                                  .only('pk', 'username', 'profile_image', 'profile_thumbnails')
+        total = 0
+        for user in users.iterator():
+            if not options['all'] and user.profile_thumbnails.get('source') == user.profile_image.name:
+                continue
+            try:
+                generate_profile_thumbnails(user.pk, user.profile_image.name)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Skipped {user.username}: {error}')
+                continue
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'Done. Generated variants for {total} profile image(s).'))
@@ -0,0 +1,28 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+
+from blog_app.sessions.base import PURGE_BATCH_SIZE, purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions from the database, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches, to spread the load on a busy database.')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            deleted = purge_expired_sessions(Session, batch_size=options['batch_size'])
+            if not deleted:
+                break
+            total += deleted
+            self.stdout.write(f'Purged {total} expired session(s)...')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Purged {total} expired session(s).'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored like_count and comment_count of every post, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+
+        for pks in Post.objects.pk_batches(batch_size):
+            total += Post.detailed.filter(pk__in=pks).recount_counters()
+            self.stdout.write(f'Recounted {total} post(s)...')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Recounted {total} post(s).'))
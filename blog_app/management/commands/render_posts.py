@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.cache import bump_card_generation, bump_page_generation
+from blog_app.models import Post
+from blog_app.rendering import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = 'Re-render the stored HTML body of posts rendered by an older renderer version, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--all', action='store_true', help='Re-render every post, not only stale ones.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = Post.objects.all() if options['all'] else Post.objects.stale_renders()
+        total = 0
+
+        for pks in posts.pk_batches(batch_size):
+            total += Post.objects.filter(pk__in=pks).render_content(batch_size)
+            self.stdout.write(f'Rendered {total} post(s)...')
+
+        if total:
+            # bulk_update leaves updated_at alone, so cards and pages keyed on it would keep the old HTML.
+            bump_card_generation()
+            bump_page_generation()
+        self.stdout.write(self.style.SUCCESS(f'Done. Rendered {total} post(s) with renderer version {RENDERER_VERSION}.'))
@@ -0,0 +1,212 @@
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger('blog_app.performance')
+
+current_profile = ContextVar('blog_app_request_profile', default=None)
+
+STATS_VIEWS_KEY = 'request-stats:views'
+STATS_KEY = 'request-stats:view:{view}'
+STATS_FIELDS = ('requests', 'total_ms', 'view_ms', 'db_ms', 'template_ms', 'queries', 'duplicates')
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ms = 0.0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.statements = Counter()
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+            self.statements[sql] += 1
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self):
+        if not self.duplicates:
+            return None
+        sql, count = self.statements.most_common(1)[0]
+        return {'sql': sql[:200], 'count': count}
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Profile a sample of requests: SQL query count and time, repeated
+    statements, view time and template render time.
+
+    Results go out as a Server-Timing header and a JSON line on the
+    'blog_app.performance' logger, and are aggregated per view in the
+    BLOG_REQUEST_PROFILING_ALIAS cache for the admin request stats page. The
+    middleware removes itself when BLOG_REQUEST_PROFILING is off.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.BLOG_REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.BLOG_REQUEST_PROFILING_SAMPLE_RATE
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile, token = self.start(request)
+        try:
+            with self.wrap_connections(profile):
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        # Async ORM calls run in the request's sync_to_async thread, which has
+        # its own connections; the execute wrappers have to go on those.
+        profile, token = self.start(request)
+        wrappers = await sync_to_async(self.wrap_connections)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+            current_profile.reset(token)
+        return await sync_to_async(self.finish)(request, response, profile)
+
+    def wrap_connections(self, profile):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile.record_query))
+        return stack
+
+    def start(self, request):
+        profile = RequestProfile()
+        request._request_profile = profile
+        return profile, current_profile.set(profile)
+
+    def finish(self, request, response, profile):
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        if profile.view_started is not None:
+            profile.view_ms = (time.perf_counter() - profile.view_started) * 1000
+
+        view_name = getattr(request.resolver_match, 'view_name', None) or 'unresolved'
+        response['Server-Timing'] = server_timing_header(profile, total_ms)
+        log_profile(request, response, view_name, profile, total_ms)
+        record_view_stats(view_name, profile, total_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, '_request_profile', None)
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+
+def server_timing_header(profile, total_ms):
+    return ', '.join([
+        f'db;dur={profile.db_ms:.1f};desc="{profile.queries} queries, {profile.duplicates} duplicates"',
+        f'view;dur={profile.view_ms:.1f}',
+        f'tpl;dur={profile.template_ms:.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+
+
+def log_profile(request, response, view_name, profile, total_ms):
+    logger.info(json.dumps({
+        'method': request.method,
+        'path': request.path,
+        'view': view_name,
+        'status': response.status_code,
+        'total_ms': round(total_ms, 2),
+        'view_ms': round(profile.view_ms, 2),
+        'db_ms': round(profile.db_ms, 2),
+        'template_ms': round(profile.template_ms, 2),
+        'queries': profile.queries,
+        'duplicates': profile.duplicates,
+        'most_repeated': profile.most_repeated(),
+    }))
+
+
+def stats_cache():
+    return caches[settings.BLOG_REQUEST_PROFILING_ALIAS]
+
+
+def record_view_stats(view_name, profile, total_ms):
+    # Read-modify-write without a lock: concurrent requests to one view can
+    # drop a sample, which is fine for sampled averages.
+    cache = stats_cache()
+    key = STATS_KEY.format(view=view_name)
+    values = cache.get_many([STATS_VIEWS_KEY, key])
+    stats = values.get(key) or dict.fromkeys(STATS_FIELDS, 0)
+    stats['requests'] += 1
+    stats['total_ms'] += total_ms
+    stats['view_ms'] += profile.view_ms
+    stats['db_ms'] += profile.db_ms
+    stats['template_ms'] += profile.template_ms
+    stats['queries'] += profile.queries
+    stats['duplicates'] += profile.duplicates
+    stats['max_ms'] = max(stats.get('max_ms', 0), total_ms)
+
+    updates = {key: stats}
+    views = values.get(STATS_VIEWS_KEY) or []
+    if view_name not in views:
+        updates[STATS_VIEWS_KEY] = sorted([*views, view_name])
+    cache.set_many(updates, timeout=None)
+
+
+def request_stats():
+    cache = stats_cache()
+    views = cache.get(STATS_VIEWS_KEY) or []
+    values = cache.get_many([STATS_KEY.format(view=view) for view in views])
+    rows = []
+    for view in views:
+        stats = values.get(STATS_KEY.format(view=view))
+        if not stats:
+            continue
+        requests = stats['requests']
+        rows.append({
+            'view': view,
+            'requests': requests,
+            'max_ms': stats['max_ms'],
+            **{f'avg_{field}': stats[field] / requests for field in STATS_FIELDS[1:]},
+        })
+    rows.sort(key=lambda row: row['avg_total_ms'] * row['requests'], reverse=True)
+    return rows
+
+
+def reset_request_stats():
+    cache = stats_cache()
+    views = cache.get(STATS_VIEWS_KEY) or []
+    cache.delete_many([STATS_VIEWS_KEY, *(STATS_KEY.format(view=view) for view in views)])
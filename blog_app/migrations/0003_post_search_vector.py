@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_search_vector(apps, schema_editor):
+    Post = apps.get_model('blog_app', 'Post')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+
+    content_type = ContentType.objects.filter(app_label='blog_app', model='post').first()
+    vector = SearchVector('title', weight='A', config='english') + SearchVector('content', weight='C', config='english')
+    if content_type is not None:
+        tag_names = TaggedItem.objects.filter(
+            content_type=content_type,
+            object_id=OuterRef('pk'),
+        ).values('object_id').annotate(
+            names=StringAgg('tag__name', delimiter=' ')
+        ).values('names')
+        vector += SearchVector(Subquery(tag_names), weight='B', config='english')
+    Post.objects.update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0002_alter_contactus_options_contactus_created_at_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
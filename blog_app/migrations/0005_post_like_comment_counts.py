@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:01
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counts(apps, schema_editor):
+    Post = apps.get_model('blog_app', 'Post')
+    Like = apps.get_model('blog_app', 'Like')
+    Comment = apps.get_model('blog_app', 'Comment')
+
+    def count_per_post(model):
+        return model.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+
+    Post.objects.update(
+        like_count=Coalesce(Subquery(count_per_post(Like)), Value(0)),
+        comment_count=Coalesce(Subquery(count_per_post(Comment)), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0004_post_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='comments'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='likes'),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 2000
+
+
+def populate_word_counts(apps, schema_editor):
+    Post = apps.get_model('blog_app', 'Post')
+    batch = []
+    for pk, content in Post.objects.values_list('pk', 'content').iterator(chunk_size=BATCH_SIZE):
+        batch.append(Post(pk=pk, word_count=len(content.split()) if content else 0))
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(batch, ['word_count'])
+            batch = []
+    Post.objects.bulk_update(batch, ['word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0007_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='words'),
+        ),
+        migrations.RunPython(populate_word_counts, migrations.RunPython.noop),
+    ]
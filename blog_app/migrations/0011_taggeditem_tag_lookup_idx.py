@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0010_post_rendered_html'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    # taggit_taggeditem belongs to taggit, so the index for "objects with tag X"
+    # lookups is managed here with raw SQL instead of a model Meta index.
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS taggit_taggeditem_tag_ct_obj_idx '
+            'ON taggit_taggeditem (tag_id, content_type_id, object_id)',
+            'DROP INDEX IF EXISTS taggit_taggeditem_tag_ct_obj_idx',
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:10
+
+import math
+
+from django.db import migrations, transaction
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+
+BATCH_SIZE = 500
+EXCERPT_WORDS = 30
+WORDS_PER_MINUTE = 200
+FIELDS = ['word_count', 'reading_time', 'excerpt_html']
+
+
+def content_stats(content):
+    # Frozen copy of blog_app.models.post.content_stats as of this migration.
+    word_count = len(content.split()) if content else 0
+    return {
+        'word_count': word_count,
+        'reading_time': math.ceil(word_count / WORDS_PER_MINUTE),
+        'excerpt_html': linebreaks(Truncator(content or '').words(EXCERPT_WORDS, truncate=' …'), autoescape=True),
+    }
+
+
+def backfill_post_content(apps, schema_editor):
+    # One-off fill of the stored stats for posts written before 0009. Bodies
+    # are left at renderer_version 0: the Markdown renderer cannot be frozen
+    # here, so `manage.py render_posts` stores them, and Post.body_html
+    # renders them on read until it has.
+    Post = apps.get_model('blog_app', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    missing = posts.filter(excerpt_html='').exclude(content='')
+    last_pk = 0
+    while True:
+        batch = list(missing.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'content')[:BATCH_SIZE])
+        if not batch:
+            break
+        with transaction.atomic(using=schema_editor.connection.alias):
+            posts.bulk_update([Post(pk=pk, **content_stats(content)) for pk, content in batch], FIELDS)
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('blog_app', '0013_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_post_content, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,11 @@ __all__ = [
     'Post',
     'ContactUs',
     'Comment',
-    'Like']
+    'Like',
+    'LikeEvent']
 
 from blog_app.models.user import CustomUser
 from blog_app.models.user import TimeStampModel
 from blog_app.models.contact_us import ContactUs
-from blog_app.models.post import Post, Comment, Like
+from blog_app.models.post import Post, Comment, Like, LikeEvent
 
@@ -1,14 +1,190 @@
-from django.db import models
+import math
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.conf import settings
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
-from django.utils.text import slugify
+from django.utils import timezone
+from django.utils.html import linebreaks
+from django.utils.text import Truncator, slugify
+from blog_app.cache import bump_page_generation
+from blog_app.rendering import RENDERER_VERSION, render_markdown
 from blog_app.models.user import TimeStampModel, CustomUser
 from taggit.managers import TaggableManager
+from taggit.models import TaggedItem
+
+
+SEARCH_CONFIG = 'english'
+EXCERPT_WORDS = 30
+WORDS_PER_MINUTE = 200
+CONTENT_STATS_BATCH_SIZE = 1000
+SLUG_MAX_LENGTH = 255
+SLUG_SUFFIX_RESERVE = 8
+SLUG_LOOKUP_CHUNK = 500
+SLUG_SAVE_ATTEMPTS = 5
+# Stored on every save that changes the content; see content_stats() and rendered_content().
+CONTENT_DERIVED_FIELDS = ('word_count', 'reading_time', 'excerpt_html', 'rendered_html', 'renderer_version')
+
+counter_signals_suspended = ContextVar('counter_signals_suspended', default=False)
+
+
+@contextmanager
+def suspend_counter_signals():
+    """
+    Skip the per-row counter and page cache signal handlers while bulk
+    writers that recount and invalidate once for the whole set are running.
+    """
+    token = counter_signals_suspended.set(True)
+    try:
+        yield
+    finally:
+        counter_signals_suspended.reset(token)
+
+
+def search_vector_expression():
+    tag_names = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post),
+        object_id=OuterRef('pk'),
+    ).values('object_id').annotate(
+        names=StringAgg('tag__name', delimiter=' ')
+    ).values('names')
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Subquery(tag_names), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='C', config=SEARCH_CONFIG)
+    )
 
 
 class PostQuerySet(models.QuerySet):
     def with_details(self):
         return self.select_related('author').prefetch_related('tags', 'likes', 'comments__user')
 
+    def for_list(self):
+        return self.select_related('author') \
+                   .prefetch_related('tags') \
+                   .defer('content', 'rendered_html', 'search_vector')
+
+    def for_detail(self):
+        return self.select_related('author').prefetch_related('tags')
+
+    def update_search_vector(self):
+        return self.update(search_vector=search_vector_expression())
+
+    def update(self, **kwargs):
+        # Stored content stats, rendered HTML and the search vector follow
+        # content, including for updates that never go through Post.save().
+        if 'content' not in kwargs:
+            return super().update(**kwargs)
+        kwargs.setdefault('updated_at', timezone.now())
+        db = self._write_db()
+        with transaction.atomic(using=db):
+            pks = list(self.using(db).values_list('pk', flat=True))
+            updated = super().update(**kwargs)
+            changed = self.model.objects.using(db).filter(pk__in=pks)
+            changed.refresh_content_stats()
+            changed.render_content()
+            changed.update_search_vector()
+        return updated
+    update.alters_data = True
+
+    def refresh_content_stats(self, batch_size=CONTENT_STATS_BATCH_SIZE):
+        return self._rewrite_from_content(content_stats, batch_size)
+
+    def render_content(self, batch_size=CONTENT_STATS_BATCH_SIZE):
+        return self._rewrite_from_content(rendered_content, batch_size)
+
+    def stale_renders(self):
+        return self.filter(renderer_version__lt=RENDERER_VERSION)
+
+    def pk_batches(self, batch_size):
+        """
+        Yield the pks of this queryset in ascending lists of up to batch_size,
+        keyset-paginated on pk so each batch is an index range scan.
+        """
+        last_pk = 0
+        while True:
+            pks = list(self.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return
+            yield pks
+            last_pk = pks[-1]
+
+    def _write_db(self):
+        # self.db is the read alias (a replica, with replicas configured) until
+        # QuerySet.update() starts; content is re-read and rewritten on the
+        # primary so a lagging replica never feeds or receives the writes.
+        return self._db or router.db_for_write(self.model, **self._hints)
+
+    def _rewrite_from_content(self, compute, batch_size):
+        db = self._write_db()
+        posts = []
+        rewritten = 0
+        for pk, content in self.using(db).order_by().values_list('pk', 'content').iterator(chunk_size=batch_size):
+            posts.append((pk, compute(content)))
+            if len(posts) == batch_size:
+                rewritten += self._save_rewritten(db, posts, batch_size)
+                posts = []
+        return rewritten + self._save_rewritten(db, posts, batch_size)
+
+    def _save_rewritten(self, db, posts, batch_size):
+        if not posts:
+            return 0
+        fields = list(posts[0][1])
+        return self.model._base_manager.using(db).bulk_update(
+            [self.model(pk=pk, **values) for pk, values in posts], fields, batch_size=batch_size
+        )
+
+    def recount_counters(self):
+        return self.update(
+            like_count=Coalesce(Subquery(_count_per_post(Like)), Value(0)),
+            comment_count=Coalesce(Subquery(_count_per_post(Comment)), Value(0)),
+        )
+
+
+def slug_base(title):
+    return slugify(title)[:SLUG_MAX_LENGTH - SLUG_SUFFIX_RESERVE].strip('-') or 'post'
+
+
+def next_free_slug(base, taken):
+    if base not in taken:
+        return base
+    counter = 1
+    while f'{base}-{counter}' in taken:
+        counter += 1
+    return f'{base}-{counter}'
+
+
+def count_words(text):
+    return len(text.split()) if text else 0
+
+
+def content_stats(content):
+    word_count = count_words(content)
+    return {
+        'word_count': word_count,
+        'reading_time': math.ceil(word_count / WORDS_PER_MINUTE),
+        'excerpt_html': linebreaks(Truncator(content or '').words(EXCERPT_WORDS, truncate=' …'), autoescape=True),
+    }
+
+
+def rendered_content(content):
+    return {'rendered_html': render_markdown(content), 'renderer_version': RENDERER_VERSION}
+
+
+def _count_per_post(model):
+    return model.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+        total=Count('pk')
+    ).values('total')
+
 
 class PostManager(models.Manager):
     def get_queryset(self):
@@ -20,20 +196,66 @@ class PostManager(models.Manager):
                    .with_details() \
                    .order_by('-created_at')
 
+    def published_posts_for_list(self):
+        return self.get_queryset() \
+                   .filter(status=Post.STATUS_PUBLISHED) \
+                   .for_list() \
+                   .order_by('-created_at')
+
+    def user_posts_for_list(self, user):
+        return self.get_queryset() \
+                   .filter(author=user) \
+                   .for_list() \
+                   .order_by('-created_at')
+
     def user_posts_with_details(self, user):
         return self.get_queryset() \
                    .filter(author=user) \
                    .with_details() \
                    .order_by('-created_at')
     
+    def taken_slugs(self, bases, exclude_pk=None):
+        # Slugs are looked up to be written; a lagging replica would miss the ones just taken.
+        posts = self.get_queryset().using(self._db or router.db_for_write(self.model))
+        taken = set()
+        bases = list(bases)
+        for start in range(0, len(bases), SLUG_LOOKUP_CHUNK):
+            chunk = bases[start:start + SLUG_LOOKUP_CHUNK]
+            condition = Q()
+            for base in chunk:
+                # Only the base and its numeric suffixes; "post" must not pull in "post-mortem-notes".
+                condition |= Q(slug__startswith=base, slug__regex=rf'^{re.escape(base)}(-[0-9]+)?$')
+            qs = posts.filter(condition)
+            if exclude_pk:
+                qs = qs.exclude(pk=exclude_pk)
+            taken.update(qs.values_list('slug', flat=True))
+        return taken
+
+    def allocate_slug(self, title, exclude_pk=None):
+        base = slug_base(title)
+        return next_free_slug(base, self.taken_slugs([base], exclude_pk=exclude_pk))
+
+    def assign_slugs(self, posts):
+        pending = [post for post in posts if not post.slug]
+        taken = self.taken_slugs({slug_base(post.title) for post in pending})
+        for post in pending:
+            post.slug = next_free_slug(slug_base(post.title), taken)
+            taken.add(post.slug)
+        return posts
+
     def get_post_by_slug_with_details(self, slug, author_username=None, status=None):
-        qs = self.get_queryset().with_details()
+        return self.get_queryset().for_detail().get(**self._slug_lookup(slug, author_username, status))
+
+    async def aget_post_by_slug_with_details(self, slug, author_username=None, status=None):
+        return await self.get_queryset().for_detail().aget(**self._slug_lookup(slug, author_username, status))
+
+    def _slug_lookup(self, slug, author_username, status):
         query_params = {'slug': slug}
         if author_username:
             query_params['author__username'] = author_username
         if status:
             query_params['status'] = status
-        return qs.get(**query_params)
+        return query_params
 
 
 class Post(TimeStampModel):
@@ -49,7 +271,7 @@ class Post(TimeStampModel):
 
     content = models.TextField()     
     title = models.CharField(max_length=255)
-    slug = models.SlugField(max_length=255, unique=True, blank=True)
+    slug = models.SlugField(max_length=SLUG_MAX_LENGTH, unique=True, blank=True)
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     status = models.CharField(
         max_length=10,
@@ -57,29 +279,84 @@ class Post(TimeStampModel):
         default=STATUS_DRAFTED
     )
     tags = TaggableManager(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    like_count = models.PositiveIntegerField('likes', default=0, editable=False)
+    comment_count = models.PositiveIntegerField('comments', default=0, editable=False)
+    word_count = models.PositiveIntegerField('words', default=0, editable=False)
+    reading_time = models.PositiveIntegerField('reading time (minutes)', default=0, editable=False)
+    excerpt_html = models.TextField(blank=True, default='', editable=False)
+    rendered_html = models.TextField(blank=True, default='', editable=False)
+    renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
     
-    objects = models.Manager()
+    objects = PostQuerySet.as_manager()
     detailed = PostManager()
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='post_status_created_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+        ]
+
     def __str__(self):
         return f'{self.title}'
     
+    @property
+    def has_more_content(self):
+        return self.word_count > EXCERPT_WORDS
+
+    @property
+    def body_html(self):
+        # Bodies stored by an older renderer are rendered in memory, without
+        # a write on a read path, until `manage.py render_posts` stores them.
+        if self.renderer_version < RENDERER_VERSION:
+            return render_markdown(self.content)
+        return self.rendered_html
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        post._loaded_text = post._searchable_text()
+        return post
+
+    def _searchable_text(self):
+        # Deferred fields read as None, so a save that loads them counts as a change.
+        return self.__dict__.get('title'), self.__dict__.get('content')
+
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        text_changed = self._state.adding or getattr(self, '_loaded_text', None) != self._searchable_text()
+        if update_fields is not None and not {'title', 'content'} & set(update_fields):
+            text_changed = False
+        if text_changed:
+            for field, value in {**content_stats(self.content), **rendered_content(self.content)}.items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *CONTENT_DERIVED_FIELDS}
         if not self.slug and self.title:
-            self.slug = slugify(self.title)
-            original_slug = self.slug
-            counter = 1
-            qs = Post.objects.filter(slug=self.slug) 
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            while qs.exists():
-                self.slug = f'{original_slug}-{counter}'
-                counter += 1
-                qs = Post.objects.filter(slug=self.slug)
-                if self.pk:
-                    qs = qs.exclude(pk=self.pk)
-
-        super().save(*args, **kwargs)
+            self._save_with_allocated_slug(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        if text_changed:
+            self.update_search_vector()
+            self._loaded_text = self._searchable_text()
+
+    def _save_with_allocated_slug(self, *args, **kwargs):
+        for attempt in range(1, SLUG_SAVE_ATTEMPTS + 1):
+            self.slug = Post.detailed.allocate_slug(self.title, exclude_pk=self.pk)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                slug_taken = Post.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if attempt == SLUG_SAVE_ATTEMPTS or not slug_taken:
+                    self.slug = ''
+                    raise
+
+    def update_search_vector(self):
+        Post.detailed.filter(pk=self.pk).update_search_vector()
 
 
 class Comment(TimeStampModel):
@@ -89,13 +366,179 @@ class Comment(TimeStampModel):
     
     class Meta:
         permissions = [('create_comment', 'Can create comment.')]
+        indexes = [
+            models.Index(fields=['post', 'created_at', 'id'], name='comment_post_created_idx'),
+        ]
+
+TOGGLE_LIKE_SQL = '''
+    WITH deleted AS (
+        DELETE FROM {like} WHERE post_id = %(post)s AND user_id = %(user)s
+        RETURNING id
+    ), inserted AS (
+        INSERT INTO {like} (post_id, user_id, created_at, updated_at)
+        SELECT %(post)s, %(user)s, %(now)s, %(now)s
+        WHERE NOT EXISTS (SELECT 1 FROM deleted)
+        ON CONFLICT (post_id, user_id) DO NOTHING
+        RETURNING id
+    ), delta AS (
+        SELECT (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted) AS value
+    )
+    UPDATE {post} SET like_count = GREATEST(like_count + (SELECT value FROM delta), 0)
+    WHERE id = %(post)s
+    RETURNING NOT EXISTS (SELECT 1 FROM deleted), like_count
+'''
+
+TOGGLE_LIKE_BATCHED_SQL = '''
+    WITH deleted AS (
+        DELETE FROM {like} WHERE post_id = %(post)s AND user_id = %(user)s
+        RETURNING id
+    ), inserted AS (
+        INSERT INTO {like} (post_id, user_id, created_at, updated_at)
+        SELECT %(post)s, %(user)s, %(now)s, %(now)s
+        WHERE NOT EXISTS (SELECT 1 FROM deleted)
+        ON CONFLICT (post_id, user_id) DO NOTHING
+        RETURNING id
+    ), delta AS (
+        SELECT (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted) AS value
+    ), event AS (
+        INSERT INTO {event} (post_id, delta, created_at)
+        SELECT %(post)s, value, %(now)s FROM delta WHERE value <> 0
+    )
+    SELECT
+        NOT EXISTS (SELECT 1 FROM deleted),
+        GREATEST(
+            (SELECT like_count FROM {post} WHERE id = %(post)s)
+            + COALESCE((SELECT SUM(delta) FROM {event} WHERE post_id = %(post)s), 0)
+            + (SELECT value FROM delta),
+            0
+        )
+'''
+
+LIKE_POSTS_SQL = '''
+    INSERT INTO {like} (post_id, user_id, created_at, updated_at)
+    SELECT DISTINCT post_id, %(user)s, %(now)s, %(now)s FROM unnest(%(posts)s::bigint[]) AS post_id
+    ON CONFLICT (post_id, user_id) DO NOTHING
+    RETURNING post_id
+'''
+
+FOLD_LIKE_EVENTS_SQL = '''
+    WITH folded AS (
+        DELETE FROM {event} WHERE id IN (
+            SELECT id FROM {event} ORDER BY id LIMIT %(limit)s FOR UPDATE SKIP LOCKED
+        )
+        RETURNING post_id, delta
+    ), totals AS (
+        SELECT post_id, SUM(delta) AS delta FROM folded GROUP BY post_id
+    ), applied AS (
+        UPDATE {post} SET like_count = GREATEST({post}.like_count + totals.delta, 0)
+        FROM totals WHERE {post}.id = totals.post_id
+    )
+    SELECT count(*) FROM folded
+'''
+
+
+class LikeManager(models.Manager):
+    def toggle(self, post, user):
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            return self._toggle_with_orm(post, user, using)
+
+        batched = settings.BLOG_LIKE_COUNT_BATCHING
+        sql = TOGGLE_LIKE_BATCHED_SQL if batched else TOGGLE_LIKE_SQL
+        sql = sql.format(
+            like=connection.ops.quote_name(self.model._meta.db_table),
+            post=connection.ops.quote_name(Post._meta.db_table),
+            event=connection.ops.quote_name(LikeEvent._meta.db_table),
+        )
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(sql, {'post': post.pk, 'user': user.pk, 'now': timezone.now()})
+            liked, like_count = cursor.fetchone()
+            transaction.on_commit(bump_page_generation, using=using)
+        return liked, like_count
+
+    def _toggle_with_orm(self, post, user, using):
+        with transaction.atomic(using=using):
+            Post.objects.using(using).select_for_update().values_list('pk', flat=True).get(pk=post.pk)
+            like, created = self.using(using).get_or_create(post=post, user=user)
+            if not created:
+                like.delete()
+            like_count = Post.objects.using(using).values_list('like_count', flat=True).get(pk=post.pk)
+        return created, like_count
+
+    def like_posts(self, post_ids, user):
+        """Like every post in post_ids as user, returning how many likes were added."""
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        with transaction.atomic(using=using):
+            if connection.vendor == 'postgresql':
+                sql = LIKE_POSTS_SQL.format(like=connection.ops.quote_name(self.model._meta.db_table))
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, {'posts': list(post_ids), 'user': user.pk, 'now': timezone.now()})
+                    added = len(cursor.fetchall())
+            else:
+                already_liked = set(
+                    self.using(using).filter(user=user, post_id__in=post_ids).values_list('post_id', flat=True)
+                )
+                new_likes = [self.model(post_id=pk, user=user) for pk in set(post_ids) - already_liked]
+                self.using(using).bulk_create(new_likes)
+                added = len(new_likes)
+            self._recount(post_ids, using)
+        return added
+
+    def unlike_posts(self, post_ids, user):
+        """Remove user's likes from every post in post_ids, returning how many were removed."""
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using), suspend_counter_signals():
+            # One DELETE for the whole set: nothing references a like, so the
+            # collector and its per-row signals have nothing to do.
+            removed = self.using(using).filter(user=user, post_id__in=post_ids)._raw_delete(using)
+            self._recount(post_ids, using)
+        return removed
+
+    def _recount(self, post_ids, using):
+        # Pending like events for these posts are already reflected in the
+        # recount; folding them later would count them twice.
+        LikeEvent.objects.using(using).filter(post_id__in=post_ids).delete()
+        Post.detailed.using(using).filter(pk__in=post_ids).recount_counters()
+        transaction.on_commit(bump_page_generation, using=using)
+
+
+class LikeEventManager(models.Manager):
+    def fold(self, batch_size=10000):
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        sql = FOLD_LIKE_EVENTS_SQL.format(
+            post=connection.ops.quote_name(Post._meta.db_table),
+            event=connection.ops.quote_name(self.model._meta.db_table),
+        )
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(sql, {'limit': batch_size})
+            folded = cursor.fetchone()[0]
+            if folded:
+                transaction.on_commit(bump_page_generation, using=using)
+        return folded
+
 
 class Like(TimeStampModel):
     post = models.ForeignKey(Post, related_name='likes', on_delete=models.CASCADE)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
 
+    objects = LikeManager()
+
     class Meta:
         unique_together = ('post', 'user')
 
     def __str__(self):
-        return f'Like by {self.user.username} on {self.post.title}'
\ No newline at end of file
+        return f'Like by {self.user.username} on {self.post.title}'
+
+
+class LikeEvent(models.Model):
+    post = models.ForeignKey(Post, related_name='like_events', on_delete=models.CASCADE)
+    delta = models.SmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = LikeEventManager()
+
+    def __str__(self):
+        return f'{self.delta:+d} like(s) on post {self.post_id}'
@@ -7,6 +7,7 @@ from blog_app.models.abstract import TimeStampModel
 class CustomUser(TimeStampModel, AbstractUser):
     bio = models.TextField(null=True, blank=True)
     profile_image = models.ImageField(null=True, blank=True)
+    profile_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     groups = models.ManyToManyField(
         Group,
         related_name='custom_user_set',
@@ -0,0 +1,150 @@
+"""
+Post body rendering: a Markdown subset to HTML, with Pygments for fenced code.
+
+Everything is escaped before any markup is applied, so the only tags in the
+output are the ones produced here. Inline patterns never scan past the next
+copy of their own delimiter, and quotes nest at most QUOTE_DEPTH_LIMIT deep,
+so rendering stays linear in the size of the post. Bump RENDERER_VERSION
+whenever the output changes; stored bodies with an older version are rendered
+in memory until `manage.py render_posts` rewrites them.
+"""
+import re
+
+from django.utils.html import escape
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
+
+
+RENDERER_VERSION = 2
+CODE_CSS_CLASS = 'codehilite'
+QUOTE_DEPTH_LIMIT = 8
+
+FENCE_RE = re.compile(r'^(```|~~~)\s*([\w+#.-]*)\s*$')
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+RULE_RE = re.compile(r'^\s{0,3}([-*_])(\s*\1){2,}\s*$')
+UNORDERED_ITEM_RE = re.compile(r'^\s{0,3}[-*+]\s+(.*)$')
+ORDERED_ITEM_RE = re.compile(r'^\s{0,3}\d{1,9}[.)]\s+(.*)$')
+QUOTE_RE = re.compile(r'^\s{0,3}>\s?(.*)$')
+
+CODE_SPAN_RE = re.compile(r'`([^`\n]+)`')
+LINK_RE = re.compile(r'\[([^\[\]\n]+)\]\(([^()\s]+)\)')
+STRONG_RE = re.compile(r'(\*\*|__)(?=\S)((?:(?!\1).)+?)(?<=\S)\1')
+EMPHASIS_RE = re.compile(r'(?<![\w*])([*_])(?=\S)((?:(?!\1).)+?)(?<=\S)\1(?![\w*])')
+SAFE_URL_RE = re.compile(r'^(https?://|mailto:|/|#)', re.IGNORECASE)
+
+_formatter = HtmlFormatter(cssclass=CODE_CSS_CLASS)
+
+
+def render_markdown(text):
+    return _render_blocks((text or '').replace('\r\n', '\n').replace('\r', '\n').split('\n'))
+
+
+def _render_blocks(lines, depth=0):
+    blocks = []
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        fence = FENCE_RE.match(line)
+        if fence:
+            code, index = _take_fenced(lines, index + 1, fence.group(1))
+            blocks.append(_highlight(code, fence.group(2)))
+        elif not line.strip():
+            index += 1
+        elif heading := HEADING_RE.match(line):
+            # Level 1 is the post title, so body headings start at <h2>.
+            level = min(len(heading.group(1)) + 1, 6)
+            blocks.append(f'<h{level}>{_inline(_strip_closing_hashes(heading.group(2)))}</h{level}>')
+            index += 1
+        elif RULE_RE.match(line):
+            blocks.append('<hr>')
+            index += 1
+        elif depth < QUOTE_DEPTH_LIMIT and QUOTE_RE.match(line):
+            # Past the limit, further '>' markers stay as paragraph text.
+            quoted, index = _take_while(lines, index, QUOTE_RE)
+            blocks.append(f'<blockquote>{_render_blocks(quoted, depth + 1)}</blockquote>')
+        elif UNORDERED_ITEM_RE.match(line):
+            items, index = _take_while(lines, index, UNORDERED_ITEM_RE)
+            blocks.append(_list('ul', items))
+        elif ORDERED_ITEM_RE.match(line):
+            items, index = _take_while(lines, index, ORDERED_ITEM_RE)
+            blocks.append(_list('ol', items))
+        else:
+            paragraph, index = _take_paragraph(lines, index)
+            blocks.append('<p>' + '<br>'.join(_inline(part) for part in paragraph) + '</p>')
+    return '\n'.join(blocks)
+
+
+def code_stylesheet(style='default'):
+    return HtmlFormatter(style=style, cssclass=CODE_CSS_CLASS).get_style_defs(f'.{CODE_CSS_CLASS}')
+
+
+def _strip_closing_hashes(text):
+    # '## Title ##' closes with hashes; stripped here rather than in
+    # HEADING_RE, where a lazy match would rescan the tail at every step.
+    return text.rstrip().rstrip('#').rstrip() or text.strip()
+
+
+def _take_fenced(lines, index, marker):
+    code = []
+    while index < len(lines) and not lines[index].strip().startswith(marker):
+        code.append(lines[index])
+        index += 1
+    return '\n'.join(code), index + 1
+
+
+def _take_while(lines, index, pattern):
+    taken = []
+    while index < len(lines) and (match := pattern.match(lines[index])):
+        taken.append(match.group(1))
+        index += 1
+    return taken, index
+
+
+def _starts_block(line):
+    return any(pattern.match(line) for pattern in (
+        FENCE_RE, HEADING_RE, RULE_RE, QUOTE_RE, UNORDERED_ITEM_RE, ORDERED_ITEM_RE
+    ))
+
+
+def _take_paragraph(lines, index):
+    paragraph = [lines[index]]
+    index += 1
+    while index < len(lines) and lines[index].strip() and not _starts_block(lines[index]):
+        paragraph.append(lines[index])
+        index += 1
+    return paragraph, index
+
+
+def _list(tag, items):
+    return f'<{tag}>' + ''.join(f'<li>{_inline(item)}</li>' for item in items) + f'</{tag}>'
+
+
+def _highlight(code, language):
+    try:
+        lexer = get_lexer_by_name(language) if language else TextLexer()
+    except ClassNotFound:
+        lexer = TextLexer()
+    return highlight(code, lexer, _formatter).strip()
+
+
+def _inline(text):
+    text = escape(text.strip())
+    code_spans = []
+
+    def stash_code(match):
+        code_spans.append(f'<code>{match.group(1)}</code>')
+        return f'\x00{len(code_spans) - 1}\x00'
+
+    def link(match):
+        label, url = match.group(1), match.group(2)
+        if not SAFE_URL_RE.match(url):
+            return label
+        return f'<a href="{url}" rel="nofollow noopener">{label}</a>'
+
+    text = CODE_SPAN_RE.sub(stash_code, text)
+    text = LINK_RE.sub(link, text)
+    text = STRONG_RE.sub(r'<strong>\2</strong>', text)
+    text = EMPHASIS_RE.sub(r'<em>\2</em>', text)
+    return re.sub(r'\x00(\d+)\x00', lambda match: code_spans[int(match.group(1))], text)
@@ -0,0 +1,5 @@
+"""
+Session engines for DJANGO_SESSION_MODE (see BLOG_SESSION_MODE in settings):
+blog_app.sessions.db, .cached_db and .signed_cookies. Each one only writes a
+session when a request actually changes its data.
+"""
@@ -0,0 +1,71 @@
+from asgiref.sync import sync_to_async
+from django.db import router, transaction
+from django.utils import timezone
+
+
+PURGE_BATCH_SIZE = 1000
+
+
+class ChangeDetectingSessionMixin:
+    """
+    `modified` is only true when the data (or the key) differs from what was
+    loaded, so setting a key to the value it already had, or a view that
+    rewrites an unchanged list, costs no write and no Set-Cookie.
+    """
+
+    def __init__(self, session_key=None):
+        # (session_key, serialized data) as loaded; None for a new session.
+        self._loaded_state = None
+        self._modified = False
+        super().__init__(session_key)
+
+    @property
+    def modified(self):
+        return self._modified and self._state() != self._loaded_state
+
+    @modified.setter
+    def modified(self, value):
+        self._modified = value
+
+    def load(self):
+        data = super().load()
+        self._loaded_state = self._state(data)
+        return data
+
+    async def aload(self):
+        data = await super().aload()
+        self._loaded_state = self._state(data)
+        return data
+
+    def _state(self, data=None):
+        if data is None:
+            data = getattr(self, '_session_cache', {})
+        return self.session_key, self.serializer().dumps(data)
+
+
+class BatchedClearExpiredMixin:
+    """`clearsessions` deletes expired rows in batches instead of one long DELETE."""
+
+    @classmethod
+    def clear_expired(cls):
+        while purge_expired_sessions(cls.get_model_class()):
+            pass
+
+    @classmethod
+    async def aclear_expired(cls):
+        await sync_to_async(cls.clear_expired)()
+
+
+def purge_expired_sessions(model, batch_size=PURGE_BATCH_SIZE):
+    """
+    Delete up to batch_size expired sessions, oldest first, and return how many
+    went. Each batch is its own short transaction, so its row locks are held
+    only while it runs; rows another transaction holds are left for the next run.
+    """
+    with transaction.atomic(using=router.db_for_write(model)):
+        expired = model.objects.filter(expire_date__lt=timezone.now()) \
+                               .order_by('expire_date') \
+                               .select_for_update(skip_locked=True) \
+                               .values('pk')[:batch_size]
+        deleted, _ = model.objects.filter(pk__in=expired).delete()
+    return deleted
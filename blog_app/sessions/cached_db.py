@@ -0,0 +1,71 @@
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+from blog_app.sessions.base import BatchedClearExpiredMixin, ChangeDetectingSessionMixin
+
+
+logger = logging.getLogger('django.contrib.sessions')
+
+WRITTEN_AT_KEY = 'blog_app.sessions.written_at:{session_key}'
+
+
+class SessionStore(ChangeDetectingSessionMixin, BatchedClearExpiredMixin, cached_db.SessionStore):
+    """
+    Sessions served from the SESSION_CACHE_ALIAS cache with a deferred database
+    write: a change only reaches django_session if the stored row is more than
+    BLOG_SESSION_WRITE_BEHIND_SECONDS old; otherwise it goes to the cache alone
+    and the row catches up on a later change. New sessions and changes to
+    Django's own keys (sign-in, sign-out, expiry) are written through at once.
+
+    Until the row catches up, the cache holds the only copy of the newest
+    data. With a per-process cache (locmem) that copy is lost when the worker
+    restarts, and other workers read the older row instead, so up to
+    BLOG_SESSION_WRITE_BEHIND_SECONDS of changes can disappear. Use a shared
+    'file' or 'db' cache backend with this store.
+    """
+    cache_key_prefix = 'blog_app.sessions.cached_db'
+
+    def __init__(self, session_key=None):
+        self._loaded_internal = None
+        super().__init__(session_key)
+
+    @property
+    def written_at_key(self):
+        return WRITTEN_AT_KEY.format(session_key=self.session_key)
+
+    def load(self):
+        data = super().load()
+        self._loaded_internal = self._internal_state(data)
+        return data
+
+    async def aload(self):
+        data = await super().aload()
+        self._loaded_internal = self._internal_state(data)
+        return data
+
+    def save(self, must_create=False):
+        if not must_create and not self._database_write_due():
+            try:
+                self._cache.set(self.cache_key, self._session, self.get_expiry_age())
+                return
+            except Exception:
+                logger.exception('Error saving to cache (%s)', self._cache)
+        super().save(must_create)
+        try:
+            self._cache.set(self.written_at_key, time.time(), self.get_expiry_age())
+        except Exception:
+            logger.exception('Error saving to cache (%s)', self._cache)
+
+    def _database_write_due(self):
+        if self._loaded_state is None or self._loaded_state[0] != self.session_key:
+            return True
+        if self._internal_state(self._session) != self._loaded_internal:
+            return True
+        written_at = self._cache.get(self.written_at_key)
+        return written_at is None or time.time() - written_at >= settings.BLOG_SESSION_WRITE_BEHIND_SECONDS
+
+    def _internal_state(self, data):
+        return self.serializer().dumps({key: value for key, value in data.items() if key.startswith('_')})
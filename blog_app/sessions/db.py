@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import db
+
+from blog_app.sessions.base import BatchedClearExpiredMixin, ChangeDetectingSessionMixin
+
+
+class SessionStore(ChangeDetectingSessionMixin, BatchedClearExpiredMixin, db.SessionStore):
+    pass
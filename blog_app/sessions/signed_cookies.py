@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import signed_cookies
+
+from blog_app.sessions.base import ChangeDetectingSessionMixin
+
+
+class SessionStore(ChangeDetectingSessionMixin, signed_cookies.SessionStore):
+    pass
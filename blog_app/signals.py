@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from taggit.models import TaggedItem
+
+from blog_app.cache import bump_page_generation, forget_recent_post_cards, forget_tag_cloud
+from blog_app.models import Comment, CustomUser, Like, Post
+from blog_app.models.post import counter_signals_suspended
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def refresh_post_on_tag_change(sender, instance, action, **kwargs):
+    if isinstance(instance, Post) and action in ('post_add', 'post_remove', 'post_clear'):
+        instance.update_search_vector()
+        # Bumping updated_at moves the post's cached cards to a new key.
+        instance.updated_at = timezone.now()
+        Post.objects.filter(pk=instance.pk).update(updated_at=instance.updated_at)
+        transaction.on_commit(bump_page_generation)
+        transaction.on_commit(forget_tag_cloud)
+
+
+def _adjust_counter(post_id, field_name, delta):
+    if counter_signals_suspended.get():
+        return
+    Post.objects.filter(pk=post_id).update(**{field_name: Greatest(F(field_name) + delta, Value(0))})
+
+
+@receiver(post_save, sender=Like)
+def increment_like_count(sender, instance, created, **kwargs):
+    if created:
+        _adjust_counter(instance.post_id, 'like_count', 1)
+
+
+@receiver(post_delete, sender=Like)
+def decrement_like_count(sender, instance, **kwargs):
+    _adjust_counter(instance.post_id, 'like_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        _adjust_counter(instance.post_id, 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    _adjust_counter(instance.post_id, 'comment_count', -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_page_cache(sender, **kwargs):
+    if counter_signals_suspended.get():
+        return
+    transaction.on_commit(bump_page_generation)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_pages_on_profile_change(sender, **kwargs):
+    # Cached pages show usernames and profile links that updated_at on posts does not cover.
+    transaction.on_commit(bump_page_generation)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_recent_post_card(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_recent_post_cards([instance.pk]))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_tag_cloud(sender, **kwargs):
+    transaction.on_commit(forget_tag_cloud)
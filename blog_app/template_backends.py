@@ -0,0 +1,33 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from blog_app.middleware import current_profile
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = current_profile.get()
+        if profile is None:
+            return super().render(context, request)
+
+        # Only the outermost render is timed, so included templates and
+        # nested render_to_string calls are not counted twice.
+        profile.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.template_depth -= 1
+            if profile.template_depth == 0:
+                profile.template_ms += (time.perf_counter() - started) * 1000
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports render time to QueryInstrumentationMiddleware."""
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name).template, self)
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
@@ -0,0 +1,136 @@
+import threading
+from collections import Counter
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog_app.cache import card_generation
+
+
+register = template.Library()
+
+CARD_TEMPLATES = {
+    'list': 'blog_app/post/_list_card.html',
+    'profile': 'blog_app/user/_post_card.html',
+    'search': 'blog_app/post/_search_card.html',
+}
+STATS_KEY = 'post-card:stats:{variant}:{outcome}'
+STATS_FLUSH_EVERY = 100
+PREFETCHED_CARDS = 'post-cards:prefetched'
+RENDER_GENERATION = 'post-cards:generation'
+
+_pending_lookups = Counter()
+_pending_lock = threading.Lock()
+
+
+def card_cache():
+    return caches[settings.BLOG_CARD_CACHE_ALIAS]
+
+
+def card_cache_key(post, variant, generation, viewer_username=''):
+    # generation is bumped by commands that rewrite stored excerpts or HTML
+    # without touching updated_at.
+    parts = [
+        'post-card', str(generation), variant, str(post.pk), post.status,
+        str(post.updated_at.timestamp()),
+        str(post.author.updated_at.timestamp()),
+    ]
+    if variant == 'profile':
+        parts += [str(post.like_count), str(post.comment_count)]
+    if variant == 'search':
+        parts.append('auth' if viewer_username else 'anon')
+    return ':'.join(parts)
+
+
+def record_card_lookup(cache, variant, outcome):
+    # Counted in process and added to the shared totals every
+    # STATS_FLUSH_EVERY lookups, so cards cost no extra cache round trips.
+    with _pending_lock:
+        _pending_lookups[(variant, outcome)] += 1
+        if _pending_lookups.total() < STATS_FLUSH_EVERY:
+            return
+        pending = dict(_pending_lookups)
+        _pending_lookups.clear()
+    _add_lookups(cache, pending)
+
+
+def flush_card_lookups(cache=None):
+    with _pending_lock:
+        pending = dict(_pending_lookups)
+        _pending_lookups.clear()
+    _add_lookups(cache or card_cache(), pending)
+
+
+def _add_lookups(cache, pending):
+    for (variant, outcome), count in pending.items():
+        key = STATS_KEY.format(variant=variant, outcome=outcome)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+
+
+def card_cache_stats():
+    cache = card_cache()
+    flush_card_lookups(cache)
+    keys = {
+        (variant, outcome): STATS_KEY.format(variant=variant, outcome=outcome)
+        for variant in CARD_TEMPLATES
+        for outcome in ('hits', 'misses')
+    }
+    values = cache.get_many(keys.values())
+    stats = []
+    for variant in CARD_TEMPLATES:
+        hits = values.get(keys[(variant, 'hits')], 0)
+        misses = values.get(keys[(variant, 'misses')], 0)
+        lookups = hits + misses
+        stats.append({
+            'variant': variant,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else None,
+        })
+    return stats
+
+
+def _render_generation(context):
+    # One generation read per template render, not per card.
+    if RENDER_GENERATION not in context.render_context:
+        context.render_context[RENDER_GENERATION] = card_generation()
+    return context.render_context[RENDER_GENERATION]
+
+
+@register.simple_tag(takes_context=True)
+def prefetch_post_cards(context, posts, variant):
+    """Look up the cached cards of posts with one get_many for the post_card tags that follow."""
+    if settings.BLOG_CARD_CACHE_ENABLED:
+        generation = _render_generation(context)
+        viewer_username = context.get('username', '')
+        keys = [card_cache_key(post, variant, generation, viewer_username) for post in posts]
+        found = card_cache().get_many(keys)
+        context.render_context[PREFETCHED_CARDS] = {key: found.get(key) for key in keys}
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post, variant):
+    viewer_username = context.get('username', '')
+    card_context = {'post': post, 'username': viewer_username}
+    if not settings.BLOG_CARD_CACHE_ENABLED:
+        return render_to_string(CARD_TEMPLATES[variant], card_context)
+
+    cache = card_cache()
+    key = card_cache_key(post, variant, _render_generation(context), viewer_username)
+    prefetched = context.render_context.get(PREFETCHED_CARDS, {})
+    html = prefetched[key] if key in prefetched else cache.get(key)
+    if html is None:
+        record_card_lookup(cache, variant, 'misses')
+        html = render_to_string(CARD_TEMPLATES[variant], card_context)
+        cache.set(key, html, timeout=settings.BLOG_CARD_CACHE_TIMEOUT)
+    else:
+        record_card_lookup(cache, variant, 'hits')
+    return mark_safe(html)
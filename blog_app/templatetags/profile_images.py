@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+
+from blog_app.images import profile_image_variant_url
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def profile_image_url(user, size='thumb', image_format='jpeg'):
+    if not user.profile_image:
+        return ''
+    return profile_image_variant_url(user, size, image_format) or user.profile_image.url
+
+
+@register.simple_tag
+def profile_picture(user, size='thumb', style=''):
+    if not user.profile_image:
+        return ''
+    alt = f'Profile image for {user.username}'
+    fallback = profile_image_variant_url(user, size, 'jpeg')
+    webp = profile_image_variant_url(user, size, 'webp')
+    if not (fallback and webp):
+        return format_html('<img src="{}" alt="{}" style="{}" />', user.profile_image.url, alt, style)
+    return format_html(
+        '<picture><source srcset="{}" type="image/webp"><img src="{}" alt="{}" style="{}" loading="lazy" /></picture>',
+        webp, fallback, alt, style,
+    )
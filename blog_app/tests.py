@@ -1,2 +1,1554 @@
+import gzip
+import json
+import os
+import runpy
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from importlib import import_module
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from threading import Barrier
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.auth.models import AnonymousUser, Permission
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import signing
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import classproperty
+from PIL import Image
+from psycopg_pool import ConnectionPool, PoolTimeout
+
+from blog_app import images
+from blog_app.admin.post import PostAdmin
+from blog_app.cache import CARD_GENERATION_KEY, anonymous_page_cache
+from blog_app.images import schedule_profile_thumbnails
+from blog_app.management.commands import generate_fake_data
+from blog_app.middleware import QueryInstrumentationMiddleware, request_stats, reset_request_stats
+from blog_app.models import Comment, CustomUser, Like, LikeEvent, Post
+from blog_app.models.post import CONTENT_DERIVED_FIELDS, content_stats, rendered_content, suspend_counter_signals
+from blog_app.rendering import QUOTE_DEPTH_LIMIT, RENDERER_VERSION, render_markdown
+from blog_app.templatetags.post_cards import (
+    STATS_FLUSH_EVERY, STATS_KEY, card_cache, card_cache_stats, flush_card_lookups, record_card_lookup,
+)
+from blog_app.templatetags.profile_images import profile_image_url, profile_picture
+from blog_app.urls import AsyncViewsURLConf
+from blog_app.views.pagination import KeysetPaginator
+from config import staticfiles
+from config.db_pool import pool_stats
+from config.db_router import PrimaryPinningMiddleware, ReplicaRouter, pinned_to_primary, replica_databases, replica_load
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class PostListProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        cls.posts = [
+            Post.objects.create(
+                title=f'Post {i}',
+                content=' '.join(['word'] * 200),
+                author=cls.author,
+                status=Post.STATUS_PUBLISHED,
+            )
+            for i in range(7)
+        ]
+        for post in cls.posts:
+            post.tags.set(['django', f'tag-{post.pk}'])
+        cls.readers = [CustomUser.objects.create(username=f'reader{i}') for i in range(30)]
+
+    def make_popular(self, post, count):
+        for reader in self.readers[:count]:
+            Like.objects.create(post=post, user=reader)
+            Comment.objects.create(post=post, user=reader, content='Nice post!')
+
+    def capture_list_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def test_post_list_query_count_does_not_depend_on_popularity(self):
+        url = reverse('blog_app:post_list')
+        _, quiet_queries = self.capture_list_queries(url)
+
+        self.make_popular(self.posts[-1], 30)
+        response, busy_queries = self.capture_list_queries(url)
+
+        self.assertEqual(len(busy_queries), len(quiet_queries))
+        self.assertEqual(len(response.context['posts']), 5)
+        for sql in busy_queries:
+            self.assertNotIn('"blog_app_like"', sql)
+            self.assertNotIn('"blog_app_comment"', sql)
+
+    def test_user_profile_query_count_does_not_depend_on_popularity(self):
+        url = reverse('blog_app:user_profile', args=[self.author.username])
+        _, quiet_queries = self.capture_list_queries(url)
+
+        self.make_popular(self.posts[-1], 30)
+        _, busy_queries = self.capture_list_queries(url)
+
+        self.assertEqual(len(busy_queries), len(quiet_queries))
+
+    def test_list_projection_fetches_one_page_without_full_content(self):
+        response, _ = self.capture_list_queries(reverse('blog_app:post_list'))
+        page = response.context['posts']
+
+        self.assertEqual(len(page.object_list), 5)
+        for post in page:
+            self.assertIn('content', post.get_deferred_fields())
+            self.assertIn('tags', post._prefetched_objects_cache)
+            self.assertNotIn('likes', post._prefetched_objects_cache)
+            self.assertNotIn('comments', post._prefetched_objects_cache)
+
+    def test_post_detail_renders_first_comment_page_only(self):
+        post = self.posts[-1]
+        reader = self.readers[0]
+        self.client.force_login(reader)
+        url = reverse('blog_app:post_detail', args=[self.author.username, post.slug])
+        self.client.get(url)
+        _, quiet_queries = self.capture_list_queries(url)
+
+        self.make_popular(post, 30)
+        response, busy_queries = self.capture_list_queries(url)
+
+        self.assertEqual(len(busy_queries), len(quiet_queries))
+        self.assertEqual(len(response.context['comments']), 20)
+        self.assertNotIn('comments', response.context['post']._prefetched_objects_cache)
+
+        comments_url = reverse('blog_app:post_comments', args=[self.author.username, post.slug])
+        response = self.client.get(comments_url, {'cursor': response.context['comments'].next_cursor, 'format': 'json'})
+        self.assertEqual(len(response.json()['comments']), 10)
+        self.assertIsNone(response.json()['next'])
+
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False, BLOG_SEARCH_MODE='fulltext')
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+
+    def publish(self, title, content):
+        return Post.objects.create(title=title, content=content, author=self.author, status=Post.STATUS_PUBLISHED)
+
+    def search(self, query):
+        response = self.client.get(reverse('blog_app:search_results'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['page_obj'])
+
+    def test_title_matches_rank_above_tag_and_content_matches(self):
+        in_content = self.publish('Weekly notes', 'Some thoughts on postgres indexes.')
+        in_title = self.publish('Postgres tuning', 'Connection limits and memory.')
+        in_tags = self.publish('Database chores', 'Vacuum and backups.')
+        in_tags.tags.set(['postgres'])
+        self.publish('Unrelated', 'Nothing to see.')
+
+        self.assertEqual(self.search('postgres'), [in_title, in_tags, in_content])
+
+    def test_vector_follows_tags_and_content_updates(self):
+        post = self.publish('Weekly notes', 'Nothing yet.')
+        self.assertEqual(self.search('kubernetes'), [])
+
+        post.tags.set(['kubernetes'])
+        self.assertEqual(self.search('kubernetes'), [post])
+
+        Post.objects.filter(pk=post.pk).update(content='Rewritten around observability.')
+        self.assertEqual(self.search('observability'), [post])
+
+    def test_saves_that_leave_the_text_alone_skip_the_vector(self):
+        post = self.publish('Weekly notes', 'Nothing yet.')
+        post = Post.objects.get(pk=post.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            post.status = Post.STATUS_ARCHIVED
+            post.save(update_fields=['status'])
+            post.save()
+        self.assertFalse(any('to_tsvector' in query['sql'] for query in queries))
+
+        post.title = 'Observability notes'
+        post.save(update_fields=['title'])
+        self.assertEqual(Post.objects.filter(search_vector='observability').get(), post)
+
+    @override_settings(BLOG_SEARCH_MODE='basic')
+    def test_basic_mode_matches_substrings_newest_first(self):
+        older = self.publish('Postgres tuning', 'Memory.')
+        newer = self.publish('Weekly notes', 'About postgresql replicas.')
+
+        self.assertEqual(self.search('postgres'), [newer, older])
+
+
+class MarkdownRenderingTests(SimpleTestCase):
+    def test_raw_html_is_escaped(self):
+        self.assertEqual(
+            render_markdown('<script>alert(1)</script> & <b onclick="x">hi</b>'),
+            '<p>&lt;script&gt;alert(1)&lt;/script&gt; &amp; &lt;b onclick=&quot;x&quot;&gt;hi&lt;/b&gt;</p>',
+        )
+
+    def test_only_safe_link_schemes_become_anchors(self):
+        self.assertEqual(
+            render_markdown('[home](/) [site](https://example.com)'),
+            '<p><a href="/" rel="nofollow noopener">home</a> '
+            '<a href="https://example.com" rel="nofollow noopener">site</a></p>',
+        )
+        for url in ('javascript:alert(1)', 'JavaScript:void', 'data:text/html;base64,PHNjcmlwdD4='):
+            with self.subTest(url=url):
+                self.assertNotIn('<a', render_markdown(f'[click]({url})'))
+
+    def test_quotes_in_link_urls_stay_inside_the_attribute(self):
+        self.assertEqual(
+            render_markdown('[x](https://example.com/"onmouseover="alert(1))'),
+            '<p>[x](https://example.com/&quot;onmouseover=&quot;alert(1))</p>',
+        )
+        self.assertEqual(
+            render_markdown("[x](/a'b\"c)"),
+            '<p><a href="/a&#x27;b&quot;c" rel="nofollow noopener">x</a></p>',
+        )
+
+    def test_fenced_code_is_highlighted(self):
+        html = render_markdown('```python\nx = "<b>"\n```')
+        self.assertIn('<div class="codehilite">', html)
+        self.assertIn('<span class="n">x</span>', html)
+        self.assertIn('&lt;b&gt;', html)
+
+        html = render_markdown('```no-such-language\n<b>plain</b>\n```')
+        self.assertIn('&lt;b&gt;plain&lt;/b&gt;', html)
+        self.assertNotIn('<span class="n">', html)
+
+    def test_nested_quotes(self):
+        self.assertEqual(
+            render_markdown('> outer\n> > inner\n> back'),
+            '<blockquote><p>outer</p>\n<blockquote><p>inner</p></blockquote>\n<p>back</p></blockquote>',
+        )
+
+    def test_inline_markup(self):
+        self.assertEqual(
+            render_markdown('**bold *nested* text**, _em_, `**code**` and snake_case_name'),
+            '<p><strong>bold <em>nested</em> text</strong>, <em>em</em>, <code>**code**</code> and snake_case_name</p>',
+        )
+
+    def test_pathological_input_renders_in_linear_time(self):
+        for text in ('*a ' * 20000, '**a ' * 20000, '[' * 20000, '[a](b' * 20000, '# a' + ' ' * 20000 + 'b'):
+            with self.subTest(text=text[:8]):
+                started = time.perf_counter()
+                render_markdown(text)
+                self.assertLess(time.perf_counter() - started, 2)
+
+    def test_deep_quotes_are_capped(self):
+        html = render_markdown('>' * 1200 + ' hi')
+
+        self.assertEqual(html.count('<blockquote>'), QUOTE_DEPTH_LIMIT)
+        self.assertIn('&gt;' * (1200 - QUOTE_DEPTH_LIMIT) + ' hi', html)
+
+
+class PostContentUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = CustomUser.objects.create(username='author')
+        cls.post = Post.objects.create(title='Notes', content='Short draft.', author=author)
+
+    def stored_content(self):
+        post = Post.objects.get(pk=self.post.pk)
+        return {field: getattr(post, field) for field in CONTENT_DERIVED_FIELDS}
+
+    def test_queryset_update_keeps_stored_content_in_step(self):
+        content = 'Hello **world**.\n\n' + 'word ' * 400
+        Post.objects.filter(pk=self.post.pk).update(content=content)
+
+        stored = self.stored_content()
+        self.assertEqual(stored, {**content_stats(content), **rendered_content(content)})
+        self.assertEqual((stored['word_count'], stored['reading_time']), (402, 3))
+        self.assertIn('<strong>world</strong>', stored['rendered_html'])
+
+    def test_updates_without_content_skip_the_rewrite(self):
+        before = self.stored_content()
+        with CaptureQueriesContext(connection) as ctx:
+            Post.objects.filter(pk=self.post.pk).update(title='Renamed')
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(self.stored_content(), before)
+
+    def test_stale_bodies_render_in_memory_until_render_posts_stores_them(self):
+        Post.objects.filter(pk=self.post.pk).update(rendered_html='', renderer_version=0)
+        post = Post.objects.get(pk=self.post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(post.body_html, '<p>Short draft.</p>')
+        self.assertEqual(Post.objects.get(pk=self.post.pk).renderer_version, 0)
+
+        call_command('render_posts', stdout=StringIO())
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual((post.rendered_html, post.renderer_version), ('<p>Short draft.</p>', RENDERER_VERSION))
+
+    def test_backfill_migration_fills_posts_saved_before_the_columns(self):
+        expected = self.stored_content()
+        Post.objects.filter(pk=self.post.pk).update(
+            word_count=0, reading_time=0, excerpt_html='', rendered_html='', renderer_version=0,
+        )
+        migration = import_module('blog_app.migrations.0014_backfill_post_content')
+        migration.backfill_post_content(django_apps, mock.Mock(connection=connection))
+
+        stored = self.stored_content()
+        self.assertEqual(stored, {**expected, 'rendered_html': '', 'renderer_version': 0})
+        self.assertEqual(Post.objects.get(pk=self.post.pk).body_html, expected['rendered_html'])
+
+        call_command('render_posts', stdout=StringIO())
+
+        self.assertEqual(self.stored_content(), expected)
+
+    def test_backfill_migration_stats_match_the_model(self):
+        migration = import_module('blog_app.migrations.0014_backfill_post_content')
+        for content in ('', 'One line.', 'First\n\nsecond <b>para</b>', 'word ' * 450):
+            with self.subTest(content=content[:20]):
+                self.assertEqual(migration.content_stats(content), content_stats(content))
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = CustomUser.objects.create(username='author')
+        start = timezone.now()
+        cls.posts = []
+        for i in range(12):
+            post = Post.objects.create(title=f'Post {i}', content='Body', author=author)
+            # Pairs share a timestamp, so the id breaks ties.
+            Post.objects.filter(pk=post.pk).update(created_at=start + timedelta(minutes=i // 2))
+            cls.posts.append(post)
+        cls.newest_first = cls.posts[::-1]
+
+    def paginator(self):
+        return KeysetPaginator(Post.objects.all(), per_page=5)
+
+    def test_pk_batches_walk_the_filtered_pks_in_order(self):
+        pks = [post.pk for post in self.posts]
+        kept = Post.objects.exclude(pk=pks[3])
+
+        with self.assertNumQueries(4):
+            batches = list(kept.pk_batches(4))
+
+        self.assertEqual(batches, [pks[:3] + pks[4:5], pks[5:9], pks[9:]])
+
+    def test_next_and_previous_cursors_walk_the_ordering(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        self.assertEqual(list(first), self.newest_first[:5])
+        self.assertEqual(list(second), self.newest_first[5:10])
+        self.assertEqual(list(third), self.newest_first[10:])
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+
+        self.assertEqual(list(paginator.page(third.previous_cursor)), self.newest_first[5:10])
+        self.assertEqual(list(paginator.page(second.previous_cursor)), self.newest_first[:5])
+        self.assertFalse(paginator.page(second.previous_cursor).has_previous())
+
+    def test_last_cursor_returns_the_oldest_page(self):
+        paginator = self.paginator()
+        last = paginator.page(paginator.last_cursor)
+
+        self.assertEqual(list(last), self.newest_first[7:])
+        self.assertFalse(last.has_next())
+        self.assertEqual(list(paginator.page(last.previous_cursor)), self.newest_first[2:7])
+
+    def test_tampered_cursor_falls_back_to_the_first_page(self):
+        paginator = self.paginator()
+        cursor = paginator.page().next_cursor
+
+        for tampered in (cursor[:-2] + 'xx', 'not-a-cursor', signing.dumps({'d': 'next', 'k': [1]})):
+            with self.subTest(cursor=tampered):
+                self.assertEqual(list(paginator.page(tampered)), self.newest_first[:5])
+
+    def test_page_is_stable_when_the_cursor_row_is_deleted(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        first[-1].delete()
+
+        self.assertEqual(list(paginator.page(first.next_cursor)), self.newest_first[5:10])
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class PostCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        cls.post = Post.objects.create(title='Post', content='Body', author=cls.author, status=Post.STATUS_PUBLISHED)
+        cls.reader = CustomUser.objects.create(username='reader')
+        cls.reader.user_permissions.add(Permission.objects.get(codename='create_comment', content_type__model='comment'))
+        cls.admin = CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True)
+
+    def counts(self):
+        self.post.refresh_from_db(fields=['like_count', 'comment_count'])
+        return self.post.like_count, self.post.comment_count
+
+    def test_views_keep_counts_in_step(self):
+        self.client.force_login(self.reader)
+        self.client.post(reverse('blog_app:add_comment', args=[self.post.slug]), {'content': 'Nice post!'})
+        self.client.post(reverse('blog_app:like_post', args=[self.author.username, self.post.slug]))
+        self.assertEqual(self.counts(), (1, 1))
+
+        self.client.post(reverse('blog_app:like_post', args=[self.author.username, self.post.slug]))
+        self.client.force_login(self.admin)
+        comment = Comment.objects.get(post=self.post)
+        self.client.post(reverse('admin:blog_app_comment_delete', args=[comment.pk]), {'post': 'yes'})
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_bulk_queryset_delete_decrements_counts(self):
+        readers = [CustomUser.objects.create(username=f'reader{i}') for i in range(3)]
+        for reader in readers:
+            Like.objects.create(post=self.post, user=reader)
+            Comment.objects.create(post=self.post, user=reader, content='Nice post!')
+        self.assertEqual(self.counts(), (3, 3))
+
+        Like.objects.filter(post=self.post).delete()
+        Comment.objects.filter(post=self.post, user__in=readers[:2]).delete()
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_suspended_signals_leave_counts_alone(self):
+        with suspend_counter_signals():
+            Comment.objects.create(post=self.post, user=self.reader, content='Nice post!')
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_recount_repairs_drift(self):
+        Like.objects.create(post=self.post, user=self.reader)
+        other = Post.objects.create(title='Other', content='Body', author=self.author)
+        Post.objects.filter(pk__in=[self.post.pk, other.pk]).update(like_count=7, comment_count=5)
+
+        call_command('recount_post_counters', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(Post.objects.values_list('like_count', 'comment_count').get(pk=other.pk), (0, 0))
+
+
+class PostSlugTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        for slug in ('hello', 'hello-2', 'hello-world', 'hello-world-1'):
+            Post.objects.create(title='Existing', slug=slug, content='Body', author=cls.author)
+
+    def test_taken_slugs_only_match_numeric_suffixes(self):
+        self.assertEqual(Post.detailed.taken_slugs(['hello']), {'hello', 'hello-2'})
+
+    def test_assign_slugs_skips_taken_and_repeated_titles(self):
+        posts = [Post(title=title, content='Body', author=self.author) for title in ('Hello', 'Hello', 'Hello world')]
+
+        Post.detailed.assign_slugs(posts)
+
+        self.assertEqual([post.slug for post in posts], ['hello-1', 'hello-3', 'hello-world-2'])
+
+    def test_save_retries_when_the_allocated_slug_is_taken_concurrently(self):
+        # The first allocation loses the race to a concurrent writer that took "hello".
+        with mock.patch.object(type(Post.detailed), 'allocate_slug', side_effect=['hello', 'hello-1']) as allocate_slug:
+            post = Post.objects.create(title='Hello', content='Body', author=self.author)
+
+        self.assertEqual(allocate_slug.call_count, 2)
+        self.assertEqual(Post.objects.get(pk=post.pk).slug, 'hello-1')
+
+
+class GenerateFakeDataTests(TestCase):
+    SMALL = {'users': 4, 'posts': 12, 'tags': 3, 'likes_per_post': 2, 'comments_per_post': 1, 'skip_search_vector': True}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        cls.post = Post.objects.create(title='Hand written', content='Body', author=cls.author, status=Post.STATUS_PUBLISHED)
+        Comment.objects.create(post=cls.post, user=cls.author, content='Mine')
+
+    def generate(self, prefix='fake', seed=7, **options):
+        call_command('generate_fake_data', prefix=prefix, seed=seed, stdout=StringIO(), **self.SMALL, **options)
+
+    def snapshot(self, prefix='fake'):
+        generated = Q(author__username__startswith=f'{prefix}_')
+        return {
+            'posts': list(Post.objects.filter(generated).order_by('created_at').values_list(
+                'title', 'slug', 'content', 'status', 'author__username', 'created_at', 'like_count', 'comment_count',
+            )),
+            'likes': list(Like.objects.filter(post__in=Post.objects.filter(generated)).order_by(
+                'post__created_at', 'user__username',
+            ).values_list('post__created_at', 'user__username')),
+            'comments': list(Comment.objects.filter(post__in=Post.objects.filter(generated)).order_by(
+                'created_at', 'content',
+            ).values_list('post__created_at', 'user__username', 'content')),
+        }
+
+    def test_same_seed_writes_the_same_rows(self):
+        self.generate()
+        first = self.snapshot()
+        self.generate(flush=True)
+
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(len(first['posts']), self.SMALL['posts'])
+
+    def test_generated_ids_follow_existing_rows(self):
+        self.generate()
+
+        self.assertFalse(Post.objects.filter(author__username__startswith='fake_', pk__lte=self.post.pk).exists())
+        self.assertFalse(CustomUser.objects.filter(username__startswith='fake_', pk__lte=self.author.pk).exists())
+        # Sequences were moved past the generated ids, so ORM inserts still succeed.
+        Post.objects.create(title='After', content='Body', author=self.author)
+        CustomUser.objects.create(username='later')
+
+    def test_flush_only_deletes_rows_generated_with_the_prefix(self):
+        self.generate(prefix='kept')
+        kept = self.snapshot('kept')
+        self.generate()
+        self.generate(flush=True)
+
+        self.assertEqual(Post.objects.filter(author__username__startswith='fake_').count(), self.SMALL['posts'])
+        self.assertEqual(self.snapshot('kept'), kept)
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 1)
+
+    def test_copy_and_insert_paths_write_the_same_rows(self):
+        with mock.patch.object(
+            generate_fake_data.Command, 'copy_rows', autospec=True, side_effect=generate_fake_data.Command.copy_rows,
+        ) as copy_rows:
+            self.generate()
+        copied = self.snapshot()
+        self.assertTrue(copy_rows.called)
+
+        with mock.patch.object(connection, 'vendor', 'other'):
+            self.generate(flush=True)
+
+        self.assertEqual(self.snapshot(), copied)
+
+
+class CardLookupStatsTests(SimpleTestCase):
+    def setUp(self):
+        flush_card_lookups()
+        card_cache().clear()
+        self.addCleanup(card_cache().clear)
+
+    def stats(self):
+        return {row['variant']: (row['hits'], row['misses']) for row in card_cache_stats()}
+
+    def test_lookups_reach_the_cache_in_batches(self):
+        cache = card_cache()
+        for _ in range(STATS_FLUSH_EVERY - 1):
+            record_card_lookup(cache, 'list', 'hits')
+        self.assertIsNone(cache.get(STATS_KEY.format(variant='list', outcome='hits')))
+
+        record_card_lookup(cache, 'profile', 'misses')
+        self.assertEqual(cache.get(STATS_KEY.format(variant='list', outcome='hits')), STATS_FLUSH_EVERY - 1)
+
+        record_card_lookup(cache, 'list', 'hits')
+        self.assertEqual(self.stats()['list'], (STATS_FLUSH_EVERY, 0))
+        self.assertEqual(self.stats()['profile'], (0, 1))
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=True)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        Post.objects.create(title='First post', content='Hello', author=cls.author, status=Post.STATUS_PUBLISHED)
+
+    def setUp(self):
+        caches[settings.BLOG_PAGE_CACHE_ALIAS].clear()
+        self.url = reverse('blog_app:post_list')
+
+    def anonymous_get(self, view):
+        request = RequestFactory().get('/cached/')
+        request.user = AnonymousUser()
+        request._messages = CookieStorage(request)
+        return view(request)
+
+    def test_second_anonymous_get_is_a_hit(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+
+    def test_authenticated_users_bypass_the_cache(self):
+        self.client.get(self.url)
+        self.client.force_login(self.author)
+        response = self.client.get(self.url)
+
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertContains(response, 'First post')
+
+    def test_responses_with_messages_or_cookies_are_not_stored(self):
+        @anonymous_page_cache
+        def with_message(request):
+            messages.info(request, 'Saved')
+            return HttpResponse('message')
+
+        @anonymous_page_cache
+        def with_cookie(request):
+            response = HttpResponse('cookie')
+            response.set_cookie('seen', '1')
+            return response
+
+        for view in (with_message, with_cookie):
+            with self.subTest(view=view.__name__):
+                self.assertNotIn('X-Page-Cache', self.anonymous_get(view))
+                self.assertNotIn('X-Page-Cache', self.anonymous_get(view))
+
+    def test_post_writes_retire_cached_pages(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(title='Second post', content='Hello', author=self.author, status=Post.STATUS_PUBLISHED)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'Second post')
+
+    def test_profile_edits_retire_cached_pages(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.username = 'renamed'
+            self.author.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'renamed')
+
+
+@override_settings(BLOG_REQUEST_PROFILING=True, BLOG_REQUEST_PROFILING_SAMPLE_RATE=1.0, BLOG_PAGE_CACHE_ENABLED=False)
+class QueryInstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        reset_request_stats()
+        self.addCleanup(reset_request_stats)
+
+    def view(self, request):
+        CustomUser.objects.count()
+        CustomUser.objects.count()
+        CustomUser.objects.filter(is_staff=True).exists()
+        return HttpResponse('ok')
+
+    async def aview(self, request):
+        await CustomUser.objects.acount()
+        await CustomUser.objects.acount()
+        await CustomUser.objects.filter(is_staff=True).aexists()
+        return HttpResponse('ok')
+
+    def test_unloads_itself_when_disabled(self):
+        with override_settings(BLOG_REQUEST_PROFILING=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                QueryInstrumentationMiddleware(self.view)
+
+    def test_sampled_requests_count_queries_and_duplicates(self):
+        middleware = QueryInstrumentationMiddleware(self.view)
+        with self.assertLogs('blog_app.performance') as logs:
+            response = middleware(RequestFactory().get('/profiled/'))
+
+        self.assertIn('desc="3 queries, 1 duplicates"', response['Server-Timing'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['most_repeated']['count'], 2)
+        [row] = request_stats()
+        self.assertEqual((row['view'], row['requests'], row['avg_queries'], row['avg_duplicates']), ('unresolved', 1, 3, 1))
+
+    def test_requests_outside_the_sample_are_left_alone(self):
+        with override_settings(BLOG_REQUEST_PROFILING_SAMPLE_RATE=0.25):
+            middleware = QueryInstrumentationMiddleware(self.view)
+        with mock.patch('blog_app.middleware.random.random', return_value=0.5):
+            response = middleware(RequestFactory().get('/profiled/'))
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(request_stats(), [])
+
+    def test_async_requests_are_profiled(self):
+        middleware = QueryInstrumentationMiddleware(self.aview)
+        with self.assertLogs('blog_app.performance'):
+            response = async_to_sync(middleware)(RequestFactory().get('/profiled/'))
+
+        self.assertIn('desc="3 queries, 1 duplicates"', response['Server-Timing'])
+
+    def test_admin_summary_lists_profiled_views(self):
+        self.client.force_login(self.admin)
+        with self.assertLogs('blog_app.performance'):
+            self.client.get(reverse('blog_app:post_list'))
+            response = self.client.get(reverse('admin:blog_app_post_request_stats'))
+
+        self.assertContains(response, 'Profiling 100% of requests')
+        self.assertContains(response, '<td>blog_app:post_list</td>', html=True)
+
+        response = self.client.post(reverse('admin:blog_app_post_request_stats'))
+        self.assertRedirects(response, reverse('admin:blog_app_post_request_stats'), fetch_redirect_response=False)
+        self.assertNotIn('blog_app:post_list', [row['view'] for row in request_stats()])
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class RecentlyViewedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        cls.reader = CustomUser.objects.create(username='reader', is_staff=True, is_superuser=True)
+        cls.first, cls.second = [
+            Post.objects.create(title=f'Post {i}', content='Hello', author=cls.author, status=Post.STATUS_PUBLISHED)
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        caches[settings.BLOG_CARD_CACHE_ALIAS].clear()
+        self.client.force_login(self.reader)
+
+    def view(self, post, username=None):
+        return self.client.get(reverse('blog_app:post_detail', args=[username or self.author.username, post.slug]))
+
+    def test_viewing_the_same_post_again_leaves_the_session_alone(self):
+        self.view(self.first)
+        response = self.view(self.first)
+
+        self.assertFalse(response.wsgi_request.session.modified)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertEqual(self.client.session['recently_viewed'], [self.first.pk])
+
+    def rename_author_in_admin(self, username):
+        request = RequestFactory().post('/')
+        request.user = self.reader
+        form = mock.Mock(changed_data=['username'])
+        self.author.username = username
+        admin.site._registry[CustomUser].save_model(request, self.author, form, change=True)
+
+    def rename_author_in_profile(self, username):
+        self.client.post(
+            reverse('blog_app:edit_profile', args=[self.author.username]),
+            {'username': username, 'email': 'author@example.com', 'first_name': '', 'last_name': '', 'bio': ''},
+        )
+        self.author.refresh_from_db()
+
+    def test_renaming_the_author_refreshes_the_rail(self):
+        for rename in (self.rename_author_in_admin, self.rename_author_in_profile):
+            with self.subTest(rename=rename.__name__):
+                old_username = self.author.username
+                self.view(self.first)
+                self.assertContains(self.view(self.second), f'/@{old_username}/{self.first.slug}/')
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    rename(f'{old_username}x')
+                response = self.view(self.second, self.author.username)
+
+                self.assertEqual(self.author.username, f'{old_username}x')
+                self.assertContains(response, f'/@{self.author.username}/{self.first.slug}/')
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class TagPostsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True)
+        author = CustomUser.objects.create(username='author')
+        cls.tagged, cls.untagged, cls.draft = [
+            Post.objects.create(title=title, content='Hello', author=author, status=status)
+            for title, status in [
+                ('Tagged post', Post.STATUS_PUBLISHED),
+                ('Untagged post', Post.STATUS_PUBLISHED),
+                ('Draft post', Post.STATUS_DRAFTED),
+            ]
+        ]
+        cls.tagged.tags.set(['django'])
+        cls.draft.tags.set(['django'])
+
+    def setUp(self):
+        card_cache().clear()
+        self.addCleanup(card_cache().clear)
+
+    def cloud(self):
+        response = self.client.get(reverse('blog_app:post_list'))
+        return {item['slug']: item['count'] for item in response.context['tag_cloud']}
+
+    def test_tag_route_lists_published_posts_with_the_tag(self):
+        response = self.client.get(reverse('blog_app:tag_posts', args=['django']))
+
+        self.assertEqual([post.title for post in response.context['posts']], ['Tagged post'])
+        self.assertEqual(response.context['tag'].slug, 'django')
+
+    def test_unknown_tag_is_a_404(self):
+        response = self.client.get(reverse('blog_app:tag_posts', args=['no-such-tag']))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tag_changes_refresh_the_cloud(self):
+        self.assertEqual(self.cloud(), {'django': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.untagged.tags.add('django', 'python')
+
+        self.assertEqual(self.cloud(), {'django': 2, 'python': 1})
+
+    def test_status_actions_refresh_the_cloud(self):
+        self.assertEqual(self.cloud(), {'django': 1})
+        self.client.force_login(self.admin)
+
+        self.client.post(reverse('admin:blog_app_post_changelist'), {
+            'action': 'publish_posts',
+            '_selected_action': [self.draft.pk],
+        })
+
+        self.assertEqual(self.cloud(), {'django': 2})
+
+
+class ProfileThumbnailTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.executor = mock.Mock()
+        self.enterContext(mock.patch('blog_app.images.image_executor', return_value=self.executor))
+
+    def upload(self, name='me.jpg'):
+        # Left half red, right half blue; EXIF says to rotate it 90 degrees
+        # clockwise, and carries a camera make that must not survive.
+        image = Image.new('RGB', (400, 200), 'blue')
+        image.paste('red', (0, 0, 200, 200))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x010F] = 'SecretCam'
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', exif=exif)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def create_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = CustomUser.objects.create(username='pic', profile_image=self.upload())
+            schedule_profile_thumbnails(user)
+            self.executor.submit.assert_not_called()
+        return user
+
+    def run_scheduled_job(self):
+        worker, *args = self.executor.submit.call_args.args
+        self.assertIs(worker, images._generate_in_worker)
+        return images.generate_profile_thumbnails(*args)
+
+    def test_variants_are_generated_after_commit(self):
+        user = self.create_user()
+        variants = self.run_scheduled_job()
+
+        user.refresh_from_db()
+        self.assertEqual(user.profile_thumbnails, {'source': user.profile_image.name, 'variants': variants})
+        self.assertEqual(set(variants), {'thumb_jpeg', 'thumb_webp', 'small_jpeg', 'small_webp'})
+        with default_storage.open(variants['small_webp']) as small:
+            self.assertEqual(Image.open(small).size, (48, 48))
+
+    def test_variants_are_rotated_and_stripped_of_exif(self):
+        self.create_user()
+        variants = self.run_scheduled_job()
+
+        with default_storage.open(variants['thumb_jpeg']) as thumb:
+            image = Image.open(thumb)
+            image.load()
+        self.assertEqual(len(image.getexif()), 0)
+        red, _, blue = image.getpixel((40, 10))
+        self.assertGreater(red, blue)
+        red, _, blue = image.getpixel((40, 140))
+        self.assertGreater(blue, red)
+
+    def test_templates_use_the_original_until_variants_match_the_image(self):
+        user = self.create_user()
+        self.assertIn(f'src="{user.profile_image.url}"', profile_picture(user))
+        self.assertEqual(profile_image_url(user, 'small'), user.profile_image.url)
+
+        old_variants = self.run_scheduled_job()
+        user.refresh_from_db()
+        self.assertIn('type="image/webp"', profile_picture(user))
+        self.assertNotEqual(profile_image_url(user, 'small'), user.profile_image.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.profile_image = self.upload('new.jpg')
+            user.save()
+            schedule_profile_thumbnails(user)
+            self.assertTrue(all(default_storage.exists(name) for name in old_variants.values()))
+        self.assertIn(f'src="{user.profile_image.url}"', profile_picture(user))
+        self.assertFalse(any(default_storage.exists(name) for name in old_variants.values()))
+
+        new_variants = self.run_scheduled_job()
+        user.refresh_from_db()
+        self.assertEqual(user.profile_thumbnails['variants'], new_variants)
+        self.assertTrue(all(default_storage.exists(name) for name in new_variants.values()))
+
+
+@override_settings(BLOG_CARD_CACHE_ENABLED=True, BLOG_PAGE_CACHE_ENABLED=False)
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = CustomUser.objects.create(username='author')
+        for i in range(5):
+            Post.objects.create(title=f'Post {i}', content=f'Body {i}.', author=author, status=Post.STATUS_PUBLISHED)
+
+    def setUp(self):
+        card_cache().clear()
+        self.addCleanup(card_cache().clear)
+        self.url = reverse('blog_app:post_list')
+
+    def test_a_page_of_cards_is_one_cache_read(self):
+        self.client.get(self.url)
+        cache = card_cache()
+        # LocMemCache.get_many is a loop over get(); keep those out of the count.
+        lookup = cache.get
+
+        def fetch_many(keys):
+            return {key: value for key in keys if (value := lookup(key)) is not None}
+
+        with mock.patch.object(cache, 'get', wraps=cache.get) as get, \
+                mock.patch.object(cache, 'get_many', side_effect=fetch_many) as get_many:
+            response = self.client.get(self.url)
+
+        self.assertContains(response, 'Post 4')
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(len(get_many.call_args.args[0]), 5)
+        card_gets = [call.args[0] for call in get.call_args_list if call.args[0].startswith('post-card:')]
+        self.assertEqual(card_gets, [CARD_GENERATION_KEY])
+
+    def test_content_rewrites_retire_cached_cards(self):
+        Post.objects.update(excerpt_html='<p>Old excerpt</p>')
+        self.assertContains(self.client.get(self.url), 'Old excerpt', count=5)
+
+        call_command('backfill_post_content_stats', '--all', stdout=StringIO())
+
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'Old excerpt')
+        self.assertContains(response, 'Body 4.')
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username='author')
+        cls.reader = CustomUser.objects.create(username='reader')
+        cls.posts = [
+            Post.objects.create(
+                title=f'Post {i}',
+                content=f'Paragraph **{i}** about django.',
+                author=cls.author,
+                status=Post.STATUS_PUBLISHED,
+            )
+            for i in range(7)
+        ]
+        for post in cls.posts:
+            post.tags.set(['django'])
+        Comment.objects.create(post=cls.posts[0], user=cls.reader, content='First!')
+
+    def get_both(self, url, data=None):
+        # Cursors are timestamped signatures; keep both responses in the same second.
+        with mock.patch.object(signing.TimestampSigner, 'timestamp', return_value='1'):
+            sync_response = self.client.get(url, data)
+            with override_settings(ROOT_URLCONF=AsyncViewsURLConf):
+                async_response = self.client.get(url, data)
+        return sync_response, async_response
+
+    def test_anonymous_pages_match_the_sync_views(self):
+        urls = [
+            (reverse('blog_app:post_list'), None),
+            (reverse('blog_app:tag_posts', args=['django']), None),
+            (reverse('blog_app:user_profile', args=[self.author.username]), None),
+            (reverse('blog_app:search_results'), {'q': 'django'}),
+        ]
+        for url, data in urls:
+            with self.subTest(url=url):
+                sync_response, async_response = self.get_both(url, data)
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.content, sync_response.content)
+
+    def test_next_page_cursor(self):
+        url = reverse('blog_app:post_list')
+        with override_settings(ROOT_URLCONF=AsyncViewsURLConf):
+            first = self.client.get(url)
+            second = self.client.get(url, {'cursor': first.context['page_obj'].next_cursor})
+
+        self.assertEqual(len(second.context['posts']), 2)
+        self.assertEqual(second.context['page_obj'].approximate_total, 7)
+
+    def test_post_detail(self):
+        post = self.posts[0]
+        url = reverse('blog_app:post_detail', args=[self.author.username, post.slug])
+        Post.objects.filter(pk=post.pk).update(rendered_html='', renderer_version=0)
+        self.client.force_login(self.reader)
+
+        with override_settings(ROOT_URLCONF=AsyncViewsURLConf):
+            response = self.client.get(url)
+
+        self.assertContains(response, '<strong>0</strong>')
+        self.assertContains(response, 'First!')
+        self.assertEqual(self.client.session['recently_viewed'], [post.pk])
+        self.assertEqual(Post.objects.get(pk=post.pk).renderer_version, 0)
+
+    def test_post_detail_redirects_anonymous_users(self):
+        post = self.posts[0]
+        url = reverse('blog_app:post_detail', args=[self.author.username, post.slug])
+        with override_settings(ROOT_URLCONF=AsyncViewsURLConf):
+            response = self.client.get(url)
+            missing = self.client.get(reverse('blog_app:post_detail', args=[self.author.username, 'missing']))
+
+        self.assertRedirects(response, f"{reverse('blog_app:login')}?next={url}", fetch_redirect_response=False)
+        self.assertEqual(missing.status_code, 404)
+
+    @override_settings(BLOG_PAGE_CACHE_ENABLED=True, ROOT_URLCONF=AsyncViewsURLConf)
+    def test_page_cache(self):
+        url = reverse('blog_app:post_list')
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+
+class PostAdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True)
+        author = CustomUser.objects.create(username='author')
+        posts = Post.objects.bulk_create(
+            Post(title=f'Post {i}', slug=f'post-{i}', content='word ' * 50, author=author) for i in range(30)
+        )
+        Like.objects.bulk_create(Like(post=post, user=cls.admin) for post in posts[::3])
+
+    def changelist_queries(self, per_page):
+        with mock.patch.object(PostAdmin, 'list_per_page', per_page):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('admin:blog_app_post_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), per_page)
+        self.captured_sql = [query['sql'] for query in ctx.captured_queries]
+        return len(ctx.captured_queries)
+
+    def test_changelist_query_count_does_not_depend_on_page_size(self):
+        self.client.force_login(self.admin)
+        self.changelist_queries(5)
+
+        self.assertEqual(self.changelist_queries(5), self.changelist_queries(30))
+
+    def test_changelist_skips_post_bodies(self):
+        self.client.force_login(self.admin)
+        self.changelist_queries(30)
+        post_selects = [sql for sql in self.captured_sql if 'FROM "blog_app_post"' in sql and sql.startswith('SELECT')]
+
+        self.assertTrue(post_selects)
+        for column in ('content', 'rendered_html', 'search_vector'):
+            with self.subTest(column=column):
+                self.assertFalse([sql for sql in post_selects if f'"blog_app_post"."{column}"' in sql])
+
+    def test_change_form_loads_the_post_body(self):
+        self.client.force_login(self.admin)
+        post = Post.objects.first()
+        response = self.client.get(reverse('admin:blog_app_post_change', args=[post.pk]))
+
+        self.assertContains(response, post.content.strip())
+        self.assertEqual(response.context['original'].get_deferred_fields(), {'search_vector'})
+
+    def test_like_status_is_per_request(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:blog_app_post_changelist'))
+        statuses = [post.liked_by_you for post in response.context['cl'].result_list]
+        self.assertEqual(statuses.count(True), 10)
+
+        other_admin = CustomUser.objects.create(username='other', is_staff=True, is_superuser=True)
+        self.client.force_login(other_admin)
+        response = self.client.get(reverse('admin:blog_app_post_changelist'))
+        self.assertFalse(any(post.liked_by_you for post in response.context['cl'].result_list))
+
+
+class PostAdminBulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True)
+        author = CustomUser.objects.create(username='author')
+        cls.posts = Post.objects.bulk_create(
+            Post(title=f'Post {i}', slug=f'post-{i}', content='word', author=author) for i in range(12)
+        )
+        Like.objects.bulk_create(Like(post=post, user=cls.admin) for post in cls.posts[:4])
+        Post.detailed.all().recount_counters()
+
+    def run_action(self, action):
+        self.client.force_login(self.admin)
+        with mock.patch.object(PostAdmin, 'bulk_action_chunk_size', 5):
+            return self.client.post(reverse('admin:blog_app_post_changelist'), {
+                'action': action,
+                'select_across': '1',
+                '_selected_action': [post.pk for post in self.posts],
+            }, follow=True)
+
+    @override_settings(BLOG_CARD_CACHE_ENABLED=True, BLOG_PAGE_CACHE_ENABLED=False)
+    def test_status_actions_refresh_cached_profile_cards(self):
+        self.addCleanup(card_cache().clear)
+        url = reverse('blog_app:user_profile', args=['author'])
+        self.assertContains(self.client.get(url), 'Status: Drafted', count=5)
+
+        self.run_action('publish_posts')
+
+        response = self.client.get(url)
+        self.assertContains(response, 'Status: Published', count=5)
+        self.assertNotContains(response, 'Status: Drafted')
+
+    def test_bulk_like_adds_missing_likes_and_recounts(self):
+        response = self.run_action('admin_like_posts_bulk')
+
+        self.assertContains(response, '8 post(s) liked. 4 post(s) already liked by you.')
+        self.assertEqual(Like.objects.filter(user=self.admin).count(), 12)
+        self.assertEqual(set(Post.objects.values_list('like_count', flat=True)), {1})
+
+    def test_bulk_unlike_removes_likes_and_recounts(self):
+        response = self.run_action('admin_unlike_posts_bulk')
+
+        self.assertContains(response, '4 post(s) unliked. 8 post(s) were not liked by you.')
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(set(Post.objects.values_list('like_count', flat=True)), {0})
+
+    def test_like_and_unlike_counts_come_from_the_writes(self):
+        post_ids = [post.pk for post in self.posts]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(Like.objects.like_posts(post_ids + post_ids, self.admin), 8)
+        self.assertEqual(Like.objects.like_posts(post_ids, self.admin), 0)
+        like_reads = [q for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'FROM "blog_app_like"' in q['sql']]
+        self.assertEqual(like_reads, [])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(Like.objects.unlike_posts(post_ids, self.admin), 12)
+        like_deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE FROM "blog_app_like"')]
+        self.assertEqual(len(like_deletes), 1)
+        self.assertEqual(set(Post.objects.values_list('like_count', flat=True)), {0})
+
+
+class LikeToggleConcurrencyTests(TransactionTestCase):
+    workers = 12
+
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.post = Post.objects.create(
+            title='Viral post', content='Everyone likes this.', author=self.author, status=Post.STATUS_PUBLISHED
+        )
+        self.readers = [CustomUser.objects.create(username=f'reader{i}') for i in range(self.workers)]
+
+    def toggle_in_parallel(self, users):
+        barrier = Barrier(len(users))
+
+        def toggle(user):
+            try:
+                barrier.wait()
+                return Like.objects.toggle(self.post, user)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            return list(pool.map(toggle, users))
+
+    def stored_like_count(self):
+        return Post.objects.values_list('like_count', flat=True).get(pk=self.post.pk)
+
+    def test_toggle_returns_new_state_and_count(self):
+        self.assertEqual(Like.objects.toggle(self.post, self.readers[0]), (True, 1))
+        self.assertEqual(Like.objects.toggle(self.post, self.readers[1]), (True, 2))
+        self.assertEqual(Like.objects.toggle(self.post, self.readers[0]), (False, 1))
+
+    def test_parallel_toggles_by_different_users_are_all_counted(self):
+        results = self.toggle_in_parallel(self.readers)
+
+        self.assertTrue(all(liked for liked, _ in results))
+        self.assertEqual(sorted(count for _, count in results), list(range(1, self.workers + 1)))
+        self.assertEqual(self.stored_like_count(), self.workers)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), self.workers)
+
+    def test_parallel_toggles_by_one_user_keep_count_consistent(self):
+        self.toggle_in_parallel([self.readers[0]] * self.workers)
+
+        self.assertEqual(self.stored_like_count(), Like.objects.filter(post=self.post).count())
+        self.assertLessEqual(self.stored_like_count(), 1)
+
+    @override_settings(BLOG_LIKE_COUNT_BATCHING=True)
+    def test_batched_toggles_are_folded_into_counts(self):
+        results = self.toggle_in_parallel(self.readers)
+        liked, count = Like.objects.toggle(self.post, self.readers[0])
+
+        self.assertTrue(all(liked for liked, _ in results))
+        self.assertEqual((liked, count), (False, self.workers - 1))
+        self.assertEqual(self.stored_like_count(), 0)
+        self.assertEqual(LikeEvent.objects.count(), self.workers + 1)
+
+        call_command('fold_like_events', stdout=StringIO())
+
+        self.assertEqual(self.stored_like_count(), self.workers - 1)
+        self.assertFalse(LikeEvent.objects.exists())
+
+
+class ProductionStaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.TemporaryDirectory()
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=cls.static_root.name,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'config.staticfiles.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed_css = staticfiles_storage.stored_name('css/style.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.static_root.cleanup()
+
+    def get(self, path, **headers):
+        request = RequestFactory().get(f'/static/{path}', headers=headers)
+        return staticfiles.serve(request, path)
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        path = Path(self.static_root.name, self.hashed_css)
+
+        self.assertRegex(self.hashed_css, r'^css/style\.[0-9a-f]{12}\.css$')
+        self.assertEqual(gzip.decompress(Path(f'{path}.gz').read_bytes()), path.read_bytes())
+        if staticfiles.brotli is not None:
+            self.assertTrue(Path(f'{path}.br').exists())
+
+    def test_precompressed_variant_is_picked_by_accept_encoding(self):
+        response = self.get(self.hashed_css, accept_encoding='gzip;q=1.0, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        identity = self.get(self.hashed_css)
+        self.assertFalse(identity.has_header('Content-Encoding'))
+        self.assertNotEqual(identity['ETag'], response['ETag'])
+
+    def test_unhashed_names_are_not_immutable(self):
+        response = self.get('css/style.css')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.get(self.hashed_css)['ETag']
+
+        self.assertEqual(self.get(self.hashed_css, if_none_match=f'W/{etag}').status_code, 304)
+        self.assertEqual(self.get(self.hashed_css, if_none_match='"other"').status_code, 200)
+
+    def test_range_requests(self):
+        body = Path(self.static_root.name, self.hashed_css).read_bytes()
+
+        partial = self.get(self.hashed_css, range='bytes=10-19')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, body[10:20])
+        self.assertEqual(partial['Content-Range'], f'bytes 10-19/{len(body)}')
+
+        suffix = self.get(self.hashed_css, range='bytes=-5')
+        self.assertEqual(suffix.content, body[-5:])
+
+        unsatisfiable = self.get(self.hashed_css, range=f'bytes={len(body)}-')
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable['Content-Range'], f'bytes */{len(body)}')
+
+
+class DatabasePoolStatsTests(TestCase):
+    def test_pool_mode_checks_connections_on_checkout(self):
+        with mock.patch.dict(os.environ, {'DJANGO_DB_POOL': 'True'}), redirect_stdout(StringIO()):
+            pooled_settings = runpy.run_path(settings.BASE_DIR / 'config' / 'settings.py')
+        database = pooled_settings['DATABASES']['default']
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (0, True))
+
+        handler = ConnectionHandler({'default': database})
+        self.addCleanup(handler['default'].close_pool)
+        self.assertIs(handler['default'].pool._check, ConnectionPool.check_connection)
+
+    def test_stats_show_saturation_timeouts_and_waits(self):
+        pool = ConnectionPool(kwargs=connection.get_connection_params(), min_size=2, max_size=2, timeout=0.2)
+        self.addCleanup(pool.close)
+        pool.wait()
+
+        with pool.connection(), pool.connection():
+            busy = pool_stats('pooled', pool)
+            with self.assertRaises(PoolTimeout):
+                with pool.connection():
+                    pass
+        idle = pool_stats('pooled', pool)
+
+        self.assertEqual((busy['in_use'], busy['available'], busy['saturation']), (2, 0, 1.0))
+        self.assertEqual((idle['in_use'], idle['available'], idle['saturation']), (0, 2, 0.0))
+        self.assertEqual((idle['requests'], idle['queued'], idle['timeouts']), (3, 1, 1))
+        self.assertGreaterEqual(idle['avg_wait_ms'], 150)
+
+    def test_admin_page_is_staff_only(self):
+        url = reverse('admin:blog_app_post_db_pool_stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(CustomUser.objects.create(username='admin', is_staff=True, is_superuser=True))
+        response = self.client.get(url)
+        self.assertContains(response, '<h1>Database pool stats</h1>', html=True)
+
+
+@override_settings(BLOG_PAGE_CACHE_ENABLED=False)
+class SessionStoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = CustomUser.objects.create(username='reader')
+        author = CustomUser.objects.create(username='author')
+        cls.posts = [
+            Post.objects.create(title=f'Post {i}', content='Body', author=author, status=Post.STATUS_PUBLISHED)
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        self.addCleanup(caches[settings.SESSION_CACHE_ALIAS].clear)
+
+    def view(self, post):
+        """Return the response and the first word of every django_session query it ran."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('blog_app:post_detail', args=['author', post.slug]))
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'].split()[0] for query in queries if 'django_session' in query['sql']]
+
+    def stored_session(self):
+        return Session.objects.get(pk=self.client.session.session_key).get_decoded()
+
+    @override_settings(SESSION_ENGINE='blog_app.sessions.db')
+    def test_unchanged_sessions_are_not_saved(self):
+        self.client.force_login(self.reader)
+        response, statements = self.view(self.posts[0])
+        self.assertEqual(statements, ['SELECT', 'UPDATE'])
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        response, statements = self.view(self.posts[0])
+        self.assertEqual(statements, ['SELECT'])
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    @override_settings(SESSION_ENGINE='blog_app.sessions.cached_db', BLOG_SESSION_WRITE_BEHIND_SECONDS=300)
+    def test_cached_db_defers_database_writes(self):
+        self.client.force_login(self.reader)
+        _, statements = self.view(self.posts[0])
+        self.assertEqual(statements, [])
+        self.assertEqual(self.client.session['recently_viewed'], [self.posts[0].pk])
+        self.assertNotIn('recently_viewed', self.stored_session())
+
+        with override_settings(BLOG_SESSION_WRITE_BEHIND_SECONDS=0):
+            _, statements = self.view(self.posts[1])
+        self.assertEqual(statements, ['UPDATE'])
+        self.assertEqual(self.stored_session()['recently_viewed'], [self.posts[1].pk, self.posts[0].pk])
+
+    @override_settings(SESSION_ENGINE='blog_app.sessions.signed_cookies')
+    def test_signed_cookie_sessions_skip_the_database(self):
+        self.client.force_login(self.reader)
+        response, statements = self.view(self.posts[0])
+        self.assertEqual(statements, [])
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        response, statements = self.view(self.posts[0])
+        self.assertEqual(statements, [])
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_purge_sessions_deletes_expired_rows_in_batches(self):
+        now = timezone.now()
+        Session.objects.bulk_create([
+            *(Session(session_key=f'expired-{i}', session_data='', expire_date=now - timedelta(days=1)) for i in range(5)),
+            Session(session_key='live-session', session_data='', expire_date=now + timedelta(days=1)),
+        ])
+        out = StringIO()
+
+        call_command('purge_sessions', batch_size=2, stdout=out)
+
+        self.assertFalse(Session.objects.filter(session_key__startswith='expired-').exists())
+        self.assertTrue(Session.objects.filter(session_key='live-session').exists())
+        self.assertIn('Purged 2 expired session(s)...', out.getvalue())
+        self.assertIn('Done. Purged 5 expired session(s).', out.getvalue())
+
+
+@override_settings(BLOG_REPLICA_DATABASES=['replica_0', 'replica_1'], BLOG_REPLICA_SELECTION='random')
+class ReplicaRouterTests(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def tearDown(self):
+        replica_load.reset()
+
+    def test_replica_urls_are_parsed_into_mirrored_aliases(self):
+        databases = replica_databases(' postgres://u:p@db-a:5432/blog,, postgres://u:p@db-b:5432/blog ')
+
+        self.assertEqual(list(databases), ['replica_0', 'replica_1'])
+        self.assertEqual(databases['replica_1']['HOST'], 'db-b')
+        self.assertEqual(databases['replica_1']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replica_databases(''), {})
+
+    def test_reads_go_to_replicas_and_writes_to_the_primary(self):
+        reads = {self.router.db_for_read(Post) for _ in range(50)}
+
+        self.assertEqual(reads, {'replica_0', 'replica_1'})
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertTrue(self.router.allow_migrate('default', 'blog_app'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'blog_app'))
+
+    def test_identity_and_cache_reads_use_the_primary(self):
+        for model in (Session, Permission, CustomUser):
+            with self.subTest(model=model.__name__):
+                self.assertEqual({self.router.db_for_read(model) for _ in range(20)}, {'default'})
+
+    @override_settings(BLOG_REPLICA_SELECTION='least_loaded')
+    def test_least_loaded_prefers_fewer_queries_in_flight_then_faster_replica(self):
+        replica_load.in_flight.update({'replica_0': 3, 'replica_1': 1})
+        self.assertEqual(self.router.db_for_read(Post), 'replica_1')
+
+        replica_load.in_flight.update({'replica_0': 0, 'replica_1': 0})
+        replica_load.average_ms.update({'replica_0': 4.0, 'replica_1': 12.0})
+        self.assertEqual(self.router.db_for_read(Post), 'replica_0')
+
+    def test_pinned_and_unconfigured_reads_use_the_primary(self):
+        token = pinned_to_primary.set(True)
+        try:
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+        finally:
+            pinned_to_primary.reset(token)
+
+        with override_settings(BLOG_REPLICA_DATABASES=[]):
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @override_settings(BLOG_PRIMARY_PIN_SECONDS=30)
+    def test_writes_pin_the_client_to_the_primary(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Post))
+            return HttpResponse()
+
+        middleware = PrimaryPinningMiddleware(view)
+        factory = RequestFactory()
+        cookie = settings.BLOG_PRIMARY_PIN_COOKIE
+
+        self.assertNotIn(cookie, middleware(factory.get('/')).cookies)
+        response = middleware(factory.post('/'))
+        self.assertEqual(response.cookies[cookie]['max-age'], 30)
+        middleware(factory.get('/', headers={'cookie': f'{cookie}=1'}))
+
+        self.assertIn(seen[0], ('replica_0', 'replica_1'))
+        self.assertEqual(seen[1:], ['default', 'default'])
+
+
+REPLICAS = ('replica_0', 'replica_1')
+
+
+@override_settings(BLOG_REPLICA_DATABASES=list(REPLICAS), BLOG_PAGE_CACHE_ENABLED=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Runs against two extra local PostgreSQL test databases standing in for
+    replicas. They hold an older copy of the post, as a lagging replica would.
+    The aliases only exist while this class runs, so the test runner neither
+    creates nor checks them.
+    """
+
+    @classproperty
+    def databases(cls):
+        return {'default', *(alias for alias in REPLICAS if alias in connections)}
+
+    @classmethod
+    def setUpClass(cls):
+        primary = connections.settings['default']
+        cls.primary_name = primary['NAME']
+        with override_settings(DATABASE_ROUTERS=[]):
+            for alias in REPLICAS:
+                connections.settings[alias] = {
+                    **primary,
+                    'TEST': {**primary['TEST'], 'NAME': f"{primary['NAME']}_{alias}", 'MIRROR': None},
+                }
+                connections[alias].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in REPLICAS:
+            connections[alias].creation.destroy_test_db(cls.primary_name, verbosity=0)
+            del connections[alias]
+            del connections.settings[alias]
+
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.reader = CustomUser.objects.create(username='reader')
+        content = 'Body.'
+        self.post = Post.objects.create(
+            title='Fresh title', content=content, author=self.author, status=Post.STATUS_PUBLISHED
+        )
+        for alias in REPLICAS:
+            CustomUser.objects.using(alias).bulk_create([self.author, self.reader])
+            Post.objects.using(alias).bulk_create([Post(
+                pk=self.post.pk, title='Stale title', slug=self.post.slug, content=content, author=self.author,
+                status=Post.STATUS_PUBLISHED, **content_stats(content), **rendered_content(content),
+            )])
+
+    def tearDown(self):
+        with override_settings(DATABASE_ROUTERS=[]):
+            for alias in REPLICAS:
+                call_command('flush', database=alias, interactive=False, inhibit_post_migrate=True, verbosity=0)
+
+    def test_reads_are_served_by_a_replica(self):
+        for selection in ('random', 'least_loaded'):
+            with self.subTest(selection=selection), override_settings(BLOG_REPLICA_SELECTION=selection):
+                response = self.client.get(reverse('blog_app:post_list'))
+                self.assertContains(response, 'Stale title')
+                self.assertNotContains(response, 'Fresh title')
+
+    def test_reads_after_a_write_are_served_by_the_primary(self):
+        self.client.force_login(self.reader)
+        response = self.client.post(reverse('blog_app:like_post', args=[self.author.username, self.post.slug]))
+        self.assertEqual(response.json(), {'liked': True, 'like_count': 1})
+
+        response = self.client.get(reverse('blog_app:post_list'))
+        self.assertContains(response, 'Fresh title')
+
+        self.client.cookies.pop(settings.BLOG_PRIMARY_PIN_COOKIE)
+        self.client.logout()
+        response = self.client.get(reverse('blog_app:post_list'))
+        self.assertContains(response, 'Stale title')
+
+    def replica_posts(self):
+        return [Post.objects.using(alias).get(pk=self.post.pk) for alias in REPLICAS]
+
+    def test_writes_check_existing_rows_on_the_primary(self):
+        # The replicas have not seen the post or the reader's like yet.
+        for alias in REPLICAS:
+            Post.objects.using(alias).filter(pk=self.post.pk).delete()
+        with suspend_counter_signals():
+            Like.objects.create(post=self.post, user=self.reader)
+
+        posts = Post.detailed.assign_slugs([Post(title='Fresh title', content='Body.', author=self.author)])
+
+        self.assertEqual(posts[0].slug, 'fresh-title-1')
+        self.assertEqual(Like.objects.like_posts([self.post.pk], self.reader), 0)
+
+    def test_content_updates_are_written_to_the_primary(self):
+        # The replicas have not seen the post yet.
+        for alias in REPLICAS:
+            Post.objects.using(alias).filter(pk=self.post.pk).delete()
+
+        Post.objects.filter(pk=self.post.pk).update(content='A **new** body.')
+
+        post = Post.objects.using('default').get(pk=self.post.pk)
+        self.assertEqual((post.word_count, post.rendered_html), (3, '<p>A <strong>new</strong> body.</p>'))
+
+    def test_render_posts_rewrites_the_primary_from_primary_content(self):
+        for alias in ('default', *REPLICAS):
+            Post.objects.using(alias).filter(pk=self.post.pk).update(rendered_html='', renderer_version=0)
+        Post.objects.using('default').filter(pk=self.post.pk).update(content='Fresh body.')
+        Post.objects.using('default').filter(pk=self.post.pk).update(rendered_html='', renderer_version=0)
+
+        call_command('render_posts', stdout=StringIO())
+
+        post = Post.objects.using('default').get(pk=self.post.pk)
+        self.assertEqual((post.rendered_html, post.renderer_version), ('<p>Fresh body.</p>', RENDERER_VERSION))
+        for replica_post in self.replica_posts():
+            self.assertEqual(replica_post.renderer_version, 0)
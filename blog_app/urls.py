@@ -1,4 +1,6 @@
-from django.urls import path
+from django.conf import settings
+from django.contrib import admin
+from django.urls import include, path
 from blog_app.views import post
 from blog_app.views import user
 from blog_app.views.post import add_comment
@@ -7,25 +9,52 @@ from blog_app.views.contact_views import contact_view
 
 app_name = 'blog_app'
 
-urlpatterns = [
-    # Post related URLs
-    path('', post.post_list, name='post_list'),
-    path('new/', post.create_post, name='create_post'),
-    path('search/', post.search_results, name='search_results'),
-    path('@<str:username>/<slug:slug>/', post.post_detail, name='post_detail'),
-    path('@<str:username>/<slug:slug>/like/', post.like_post, name='like_post'),
-    path('@<str:username>/<slug:slug>/edit/', post.edit_post, name='edit_post'), 
-
-    # Comment related
-    path('posts/<slug:slug>/comment/add/', add_comment, name='add_comment'),
-
-    # User account related URLs
-    path('account/signup/', user.user_register, name='signup'),
-    path('account/login/', user.custom_user_login, name='login'),
-    path('account/logout/', user.user_logout, name='logout'),
-    path('account/@<str:username>/', user.user_profile, name='user_profile'),
-    path('account/@<str:username>/edit/', user.edit_profile, name='edit_profile'),
-
-    # Other
-    path('contact/', contact_view, name='contact_view'),
-]
+
+def build_urlpatterns(async_views):
+    # The read-heavy views have async twins for ASGI workers; see
+    # BLOG_ASYNC_VIEWS in settings.
+    reads = {
+        'post_list': post.apost_list if async_views else post.post_list,
+        'search_results': post.asearch_results if async_views else post.search_results,
+        'tag_posts': post.atag_posts if async_views else post.tag_posts,
+        'post_detail': post.apost_detail if async_views else post.post_detail,
+        'user_profile': user.auser_profile if async_views else user.user_profile,
+    }
+    return [
+        # Post related URLs
+        path('', reads['post_list'], name='post_list'),
+        path('new/', post.create_post, name='create_post'),
+        path('search/', reads['search_results'], name='search_results'),
+        path('tags/<slug:slug>/', reads['tag_posts'], name='tag_posts'),
+        path('@<str:username>/<slug:slug>/', reads['post_detail'], name='post_detail'),
+        path('@<str:username>/<slug:slug>/like/', post.like_post, name='like_post'),
+        path('@<str:username>/<slug:slug>/edit/', post.edit_post, name='edit_post'), 
+
+        # Comment related
+        path('posts/<slug:slug>/comment/add/', add_comment, name='add_comment'),
+        path('@<str:username>/<slug:slug>/comments/', post.post_comments, name='post_comments'),
+
+        # User account related URLs
+        path('account/signup/', user.user_register, name='signup'),
+        path('account/login/', user.custom_user_login, name='login'),
+        path('account/logout/', user.user_logout, name='logout'),
+        path('account/@<str:username>/', reads['user_profile'], name='user_profile'),
+        path('account/@<str:username>/edit/', user.edit_profile, name='edit_profile'),
+
+        # Other
+        path('contact/', contact_view, name='contact_view'),
+    ]
+
+
+urlpatterns = build_urlpatterns(settings.BLOG_ASYNC_VIEWS)
+
+
+class AsyncViewsURLConf:
+    """
+    A ROOT_URLCONF serving the async read views whatever BLOG_ASYNC_VIEWS is,
+    for tests and benchmarks that compare them with the sync ones.
+    """
+    urlpatterns = [
+        path('admin/', admin.site.urls),
+        path('blog_app/', include((build_urlpatterns(async_views=True), 'blog_app'), namespace='blog_app')),
+    ]
@@ -0,0 +1,195 @@
+import json
+from datetime import datetime
+
+from django.core import signing
+from django.db import connections
+from django.db.models import Q
+
+
+CURSOR_SALT = 'blog_app.views.pagination.cursor'
+EXACT_COUNT_THRESHOLD = 1000
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def approximate_total(self):
+        return self.paginator.approximate_total
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a stable ordering, (created_at, id) by default.
+
+    Pages are fetched with a WHERE clause on the ordering keys instead of an
+    OFFSET, so every page costs the same as the first one. Cursors are signed
+    tokens that carry the keys of the boundary row and the direction.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-created_at', '-id'), approximate_total=False):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.count_approximately = approximate_total
+
+    def page(self, cursor=None):
+        direction, keys = self.decode_cursor(cursor)
+        if direction == 'prev':
+            return self._page_before(keys)
+        return self._page_after(keys)
+
+    def encode_cursor(self, direction, obj=None):
+        keys = None
+        if obj is not None:
+            keys = [self._encode_value(getattr(obj, name)) for name, _ in self._keys()]
+        return signing.dumps({'d': direction, 'k': keys}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return 'next', None
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            direction, keys = payload['d'], payload['k']
+        except (signing.BadSignature, KeyError, TypeError, json.JSONDecodeError):
+            return 'next', None
+        if direction not in ('next', 'prev'):
+            return 'next', None
+        if keys is not None and len(keys) != len(self.ordering):
+            return 'next', None
+        return direction, keys
+
+    @property
+    def last_cursor(self):
+        return self.encode_cursor('prev')
+
+    @property
+    def approximate_total(self):
+        if not self.count_approximately:
+            return None
+        if not hasattr(self, '_approximate_total'):
+            self._approximate_total = approximate_count(self.object_list)
+        return self._approximate_total
+
+    def _keys(self):
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def _encode_value(self, value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def _keyset_filter(self, keys, forward):
+        condition = Q()
+        equal_so_far = Q()
+        for (name, descending), value in zip(self._keys(), keys):
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+
+    def _page_after(self, keys):
+        return self._after_page(list(self._after_queryset(keys)), keys)
+
+    def _page_before(self, keys):
+        page = self._before_page(list(self._before_queryset(keys)), keys)
+        return page if page is not None else self._page_after(None)
+
+    async def apage(self, cursor=None):
+        """
+        Async page(). The approximate total is fetched up front, since
+        templates cannot run queries from an async view.
+        """
+        direction, keys = self.decode_cursor(cursor)
+        if self.count_approximately and not hasattr(self, '_approximate_total'):
+            self._approximate_total = await aapproximate_count(self.object_list)
+        if direction == 'prev':
+            rows = [row async for row in self._before_queryset(keys)]
+            page = self._before_page(rows, keys)
+            if page is not None:
+                return page
+            keys = None
+        rows = [row async for row in self._after_queryset(keys)]
+        return self._after_page(rows, keys)
+
+    def _after_queryset(self, keys):
+        queryset = self.object_list.order_by(*self.ordering)
+        if keys is not None:
+            queryset = queryset.filter(self._keyset_filter(keys, forward=True))
+        return queryset[:self.per_page + 1]
+
+    def _after_page(self, rows, keys):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        next_cursor = self.encode_cursor('next', rows[-1]) if has_more else None
+        previous_cursor = self.encode_cursor('prev', rows[0]) if keys is not None and rows else None
+        return KeysetPage(rows, self, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    def _before_queryset(self, keys):
+        queryset = self.object_list.order_by(*self._reversed_ordering())
+        if keys is not None:
+            queryset = queryset.filter(self._keyset_filter(keys, forward=False))
+        return queryset[:self.per_page + 1]
+
+    def _before_page(self, rows, keys):
+        # None when there is nothing before the cursor; callers fall back to
+        # the first page.
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+
+        if not rows:
+            return None
+        next_cursor = self.encode_cursor('next', rows[-1]) if keys is not None else None
+        previous_cursor = self.encode_cursor('prev', rows[0]) if has_more else None
+        return KeysetPage(rows, self, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+def approximate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < EXACT_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+async def aapproximate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return await queryset.acount()
+    plan = json.loads(await queryset.order_by().aexplain(format='json'))
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < EXACT_COUNT_THRESHOLD:
+        return await queryset.acount()
+    return estimate
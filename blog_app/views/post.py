@@ -1,15 +1,26 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
 from django.http import JsonResponse
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, permission_required
-from blog_app.models import Post, Like
+from blog_app.models import Comment, Post, Like
+from blog_app.cache import anonymous_page_cache, arecent_post_cards, atag_cloud, recent_post_cards, tag_cloud
 from blog_app.forms.search import SearchForm
 from django.contrib import messages
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
 from django.urls import reverse
 from blog_app.forms.post import PostForm, CommentForm
 from django.views.decorators.csrf import csrf_exempt
-from blog_app.views.utils import clean_tags
+from blog_app.models.post import SEARCH_CONFIG
+from blog_app.views.pagination import KeysetPaginator
+from blog_app.views.utils import aload_user, clean_tags, highlight_snippet
+from taggit.models import Tag, TaggedItem
+
+
+COMMENTS_PER_PAGE = 20
 
 
 @login_required
@@ -84,36 +95,57 @@ def edit_post(request, username, slug):
             {'form': form, 'post': post, 'is_editing': True}
         )
         
+@anonymous_page_cache
 def post_list(request):
-    all_posts_list = Post.detailed.published_posts_with_details()
+    all_posts_list = Post.detailed.published_posts_for_list()
     
-    paginator = Paginator(all_posts_list, per_page=5)
+    paginator = KeysetPaginator(all_posts_list, per_page=5, approximate_total=True)
+    posts_page_obj = paginator.page(request.GET.get('cursor'))
+
+    context = {'posts': posts_page_obj, 'page_obj': posts_page_obj, 'tag_cloud': tag_cloud()}
+    return render(request, 'blog_app/post/list.html', context)
 
-    page_number = request.GET.get('page')
-    try:
-        posts_page_obj = paginator.page(page_number)
-    except PageNotAnInteger:
-        posts_page_obj = paginator.page(1)
-    except EmptyPage:
-        posts_page_obj = paginator.page(paginator.num_pages)
 
-    context = {'posts': posts_page_obj, 'page_obj': posts_page_obj}
+@anonymous_page_cache
+async def apost_list(request):
+    paginator = KeysetPaginator(Post.detailed.published_posts_for_list(), per_page=5, approximate_total=True)
+    posts_page_obj = await paginator.apage(request.GET.get('cursor'))
+
+    context = {'posts': posts_page_obj, 'page_obj': posts_page_obj, 'tag_cloud': await atag_cloud()}
     return render(request, 'blog_app/post/list.html', context)
 
 
+@anonymous_page_cache
+def tag_posts(request, slug):
+    tag = get_object_or_404(Tag, slug=slug)
+    paginator = tag_posts_paginator(tag, ContentType.objects.get_for_model(Post))
+    posts_page_obj = paginator.page(request.GET.get('cursor'))
+
+    context = {'tag': tag, 'posts': posts_page_obj, 'page_obj': posts_page_obj, 'tag_cloud': tag_cloud()}
+    return render(request, 'blog_app/post/tag_posts.html', context)
+
+
+@anonymous_page_cache
+async def atag_posts(request, slug):
+    tag = await aget_object_or_404(Tag, slug=slug)
+    content_type = await sync_to_async(ContentType.objects.get_for_model)(Post)
+    posts_page_obj = await tag_posts_paginator(tag, content_type).apage(request.GET.get('cursor'))
+
+    context = {'tag': tag, 'posts': posts_page_obj, 'page_obj': posts_page_obj, 'tag_cloud': await atag_cloud()}
+    return render(request, 'blog_app/post/tag_posts.html', context)
+
+
+def tag_posts_paginator(tag, content_type):
+    tagged_post_ids = TaggedItem.objects.filter(tag=tag, content_type=content_type).values('object_id')
+    tag_posts_list = Post.detailed.published_posts_for_list().filter(pk__in=tagged_post_ids)
+    return KeysetPaginator(tag_posts_list, per_page=5, approximate_total=True)
+
+
 @csrf_exempt
 @login_required
 def like_post(request, username, slug):
     post = get_object_or_404(Post, slug=slug, author__username=username, status=Post.STATUS_PUBLISHED)
-    user = request.user
-    like_instance, created = Like.objects.get_or_create(post=post, user=user)
-
-    if not created:
-        like_instance.delete()
-        liked = False
-    else:
-        liked = True
-    like_count = post.likes.count()
+    liked, like_count = Like.objects.toggle(post, request.user)
     return JsonResponse({'liked': liked, 'like_count': like_count})
 
 
@@ -133,49 +165,157 @@ def post_detail(request, username, slug):
         return redirect('blog_app:user_profile', username=request.user.username)
 
     comment_form = CommentForm()
-    recently_viewed_posts_slugs = request.session.get('recently_viewed', [])
-    
-    if post.slug not in recently_viewed_posts_slugs:
-        recently_viewed_posts_slugs.insert(0, post.slug)
-        request.session['recently_viewed'] = recently_viewed_posts_slugs[:5] 
-
-    recent_posts_objects = Post.detailed.published_posts_with_details().filter(
-        slug__in=request.session.get('recently_viewed', [])
-    ).exclude(pk=post.pk)
+    recently_viewed = remember_recently_viewed(request, post)
 
     context = {
         'post': post,
         'comment_form': comment_form,
-        'recently_viewed_posts': recent_posts_objects,
+        'comments': comments_page(post),
+        'recently_viewed_posts': recent_post_cards([pk for pk in recently_viewed if pk != post.pk]),
         'username': username
     }
     return render(request, 'blog_app/post/detail.html', context=context)
 
 
+async def apost_detail(request, username, slug):
+    try:
+        post = await Post.detailed.aget_post_by_slug_with_details(slug=slug, author_username=username)
+    except Post.DoesNotExist:
+        return await aget_object_or_404(Post, author__username=username, slug=slug)
+
+    await aload_user(request)
+    if not request.user.is_authenticated:
+        messages.error(request, "You need to be logged in to view this post.")
+        login_url = reverse('blog_app:login')
+        return redirect(f'{login_url}?next={request.path}')
+
+    if post.status == Post.STATUS_DRAFTED and not (request.user == post.author or request.user.is_staff):
+        messages.error(request, "You do not have permission to view this draft.")
+        return redirect('blog_app:user_profile', username=request.user.username)
+
+    recently_viewed = remember_recently_viewed(request, post)
+
+    context = {
+        'post': post,
+        'comment_form': CommentForm(),
+        'comments': await acomments_page(post),
+        'recently_viewed_posts': await arecent_post_cards([pk for pk in recently_viewed if pk != post.pk]),
+        'username': username
+    }
+    return render(request, 'blog_app/post/detail.html', context=context)
+
+
+@login_required
+def post_comments(request, username, slug):
+    post = get_object_or_404(
+        Post.objects.select_related('author').only('slug', 'status', 'author__username'),
+        author__username=username,
+        slug=slug
+    )
+    if post.status == Post.STATUS_DRAFTED and not (request.user == post.author or request.user.is_staff):
+        return JsonResponse({'error': 'You do not have permission to view this draft.'}, status=403)
+
+    page = comments_page(post, request.GET.get('cursor'))
+    if request.GET.get('format') == 'json':
+        next_url = None
+        if page.has_next():
+            next_url = f"{reverse('blog_app:post_comments', args=[username, slug])}?cursor={page.next_cursor}&format=json"
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.pk,
+                    'user': comment.user.username,
+                    'content': comment.content,
+                    'created_at': comment.created_at.isoformat(),
+                }
+                for comment in page
+            ],
+            'next': next_url,
+        })
+    return render(request, 'blog_app/post/_comment_page.html', {'post': post, 'comments': page})
+
+
+def comments_page(post, cursor=None):
+    return comments_paginator(post).page(cursor)
+
+
+async def acomments_page(post, cursor=None):
+    return await comments_paginator(post).apage(cursor)
+
+
+def comments_paginator(post):
+    comments = Comment.objects.filter(post=post) \
+                              .select_related('user') \
+                              .only('content', 'created_at', 'post_id', 'user__username')
+    return KeysetPaginator(comments, per_page=COMMENTS_PER_PAGE, ordering=('created_at', 'id'))
+
+
+def remember_recently_viewed(request, post, size=5):
+    # Older sessions stored slugs; only post ids are kept now.
+    stored = request.session.get('recently_viewed', [])
+    recently_viewed = [pk for pk in stored if isinstance(pk, int)]
+    if post.pk not in recently_viewed:
+        recently_viewed = [post.pk] + recently_viewed[:size - 1]
+    if recently_viewed != stored:
+        request.session['recently_viewed'] = recently_viewed
+    return recently_viewed
+
+
 def search_results(request):
-    search_form = SearchForm(request.GET)
     query = request.GET.get('q')
-    posts_qs = Post.objects.none()
+    posts_qs, ordering = search_queryset(query)
+    if query and not posts_qs.exists():
+        messages.info(request, f"No posts found for '{query}'.")
+
+    paginator = KeysetPaginator(posts_qs, per_page=5, ordering=ordering, approximate_total=bool(query))
+    page_obj = paginator.page(request.GET.get('cursor'))
+    return render_search_results(request, query, page_obj)
+
+
+async def asearch_results(request):
+    await aload_user(request)
+    query = request.GET.get('q')
+    posts_qs, ordering = search_queryset(query)
+    if query and not await posts_qs.aexists():
+        messages.info(request, f"No posts found for '{query}'.")
+
+    paginator = KeysetPaginator(posts_qs, per_page=5, ordering=ordering, approximate_total=bool(query))
+    page_obj = await paginator.apage(request.GET.get('cursor'))
+    return render_search_results(request, query, page_obj)
+
+
+def search_queryset(query):
+    if not query:
+        return Post.objects.none(), ('-created_at', '-id')
 
-    if query:
+    if settings.BLOG_SEARCH_MODE == 'fulltext':
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
         posts_qs = Post.objects.filter(
-            (Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)) & 
-            Q(status=Post.STATUS_PUBLISHED)
-        ).select_related('author').prefetch_related('tags').distinct().order_by('-created_at')
-        
-        if not posts_qs.exists():
-            messages.info(request, f"No posts found for '{query}'.")
+            search_vector=search_query,
+            status=Post.STATUS_PUBLISHED
+        ).annotate(
+            rank=Cast(SearchRank(F('search_vector'), search_query), FloatField()),
+            headline=SearchHeadline(
+                'content', search_query, config=SEARCH_CONFIG,
+                start_sel='<mark>', stop_sel='</mark>', max_words=35, min_words=15
+            )
+        ).select_related('author').prefetch_related('tags').defer('content', 'rendered_html', 'search_vector')
+        return posts_qs, ('-rank', '-created_at', '-id')
 
-    paginator = Paginator(posts_qs, 5)
-    page_number = request.GET.get('page')
+    posts_qs = Post.objects.filter(
+        (Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)) & 
+        Q(status=Post.STATUS_PUBLISHED)
+    ).select_related('author').prefetch_related('tags').defer('content', 'rendered_html', 'search_vector').distinct()
+    return posts_qs, ('-created_at', '-id')
 
-    try:
-        page_obj = paginator.page(page_number)
-    except (PageNotAnInteger, EmptyPage):
-        page_obj = paginator.page(1)
+
+def render_search_results(request, query, page_obj):
+    for post in page_obj:
+        if hasattr(post, 'headline'):
+            post.snippet = highlight_snippet(post.headline)
 
     context = {
-        'search_form': search_form,
+        'search_form': SearchForm(request.GET),
         'query': query,
         'page_obj': page_obj,
         'username': request.user.username if request.user.is_authenticated else ''
@@ -1,4 +1,4 @@
-from django.shortcuts import render, redirect, get_object_or_404, resolve_url
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404, resolve_url
 from django.contrib.auth import logout, authenticate, login
 from blog_app.models import CustomUser, Post
 from blog_app.forms.user import CustomLoginForm
@@ -7,7 +7,9 @@ from django.contrib import messages
 from blog_app.forms.user import UserRegistration
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from blog_app.cache import anonymous_page_cache, forget_recent_post_cards
+from blog_app.images import schedule_profile_thumbnails
+from blog_app.views.pagination import KeysetPaginator
 
 
 def user_register(request):
@@ -78,19 +80,28 @@ def user_logout(request):
     return redirect('blog_app:post_list')
 
 
+@anonymous_page_cache
 def user_profile(request, username):
     profile_user = get_object_or_404(CustomUser, username=username)
     
-    user_posts_qs = Post.detailed.user_posts_with_details(user=profile_user)
+    user_posts_qs = Post.detailed.user_posts_for_list(user=profile_user)
 
-    paginator = Paginator(user_posts_qs, per_page=5)
-    page_number = request.GET.get('page')
-    try:
-        user_posts_page_obj = paginator.page(page_number)
-    except PageNotAnInteger:
-        user_posts_page_obj = paginator.page(1)
-    except EmptyPage:
-        user_posts_page_obj = paginator.page(paginator.num_pages)
+    paginator = KeysetPaginator(user_posts_qs, per_page=5, approximate_total=True)
+    user_posts_page_obj = paginator.page(request.GET.get('cursor'))
+
+    context = {
+        'profile_user': profile_user,
+        'user_posts': user_posts_page_obj,
+    }
+    return render(request, 'blog_app/user/user_profile.html', context)
+
+
+@anonymous_page_cache
+async def auser_profile(request, username):
+    profile_user = await aget_object_or_404(CustomUser, username=username)
+
+    paginator = KeysetPaginator(Post.detailed.user_posts_for_list(user=profile_user), per_page=5, approximate_total=True)
+    user_posts_page_obj = await paginator.apage(request.GET.get('cursor'))
 
     context = {
         'profile_user': profile_user,
@@ -111,6 +122,10 @@ def edit_profile(request, username):
         form = UserProfile(request.POST, request.FILES, instance=user_to_edit)
         if form.is_valid():
             updated_user = form.save()
+            if 'profile_image' in form.changed_data:
+                schedule_profile_thumbnails(updated_user)
+            if 'username' in form.changed_data:
+                forget_recent_post_cards(Post.objects.filter(author=updated_user).values_list('pk', flat=True))
             messages.success(request, 'Your profile updated successfully!')
             return redirect('blog_app:user_profile', username=updated_user.username) 
         else:
@@ -1,2 +1,22 @@
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
 def clean_tags(tag_string):
-    return [tag.strip() for tag in tag_string.split(',') if tag.strip()]
\ No newline at end of file
+    return [tag.strip() for tag in tag_string.split(',') if tag.strip()]
+
+
+def highlight_snippet(headline):
+    escaped = escape(headline)
+    escaped = escaped.replace('&lt;mark&gt;', '<mark>').replace('&lt;/mark&gt;', '</mark>')
+    return mark_safe(escaped)
+
+
+async def aload_user(request):
+    """
+    Resolve request.user (and with it the session) without blocking the event
+    loop, so templates, messages and the page cache can read them from an
+    async view without running a query.
+    """
+    request.user = await request.auser()
+    return request.user
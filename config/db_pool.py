@@ -0,0 +1,46 @@
+"""
+Connection pool stats for DJANGO_DB_POOL=True (see BLOG_DB_POOL in settings).
+
+Pools belong to a worker process, so the numbers describe the worker that
+served the request, not the whole deployment.
+"""
+from django.db import connections
+
+
+def pool_stats(alias, pool):
+    stats = pool.get_stats()
+    # psycopg_pool leaves counters out until they are non-zero.
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    requests = stats.get('requests_num', 0)
+    queued = stats.get('requests_queued', 0)
+    in_use = size - available
+    return {
+        'alias': alias,
+        'min_size': stats.get('pool_min', 0),
+        'max_size': stats.get('pool_max', 0),
+        'size': size,
+        'in_use': in_use,
+        'available': available,
+        'saturation': in_use / stats['pool_max'] if stats.get('pool_max') else None,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': requests,
+        'queued': queued,
+        'timeouts': stats.get('requests_errors', 0),
+        'avg_wait_ms': stats.get('requests_wait_ms', 0) / queued if queued else 0.0,
+        'avg_usage_ms': stats.get('usage_ms', 0) / requests if requests else 0.0,
+        'connections_opened': stats.get('connections_num', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'returns_bad': stats.get('returns_bad', 0),
+    }
+
+
+def db_pool_stats():
+    """One row per database with a pool, for the worker process serving the call."""
+    rows = []
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None:
+            rows.append(pool_stats(alias, pool))
+    return rows
+
@@ -0,0 +1,160 @@
+"""
+Read replica routing.
+
+DATABASE_REPLICA_URLS adds read-only aliases replica_0, replica_1, ... next to
+'default' (see settings). ReplicaRouter sends reads to them and everything else
+to the primary. PrimaryPinningMiddleware keeps a client's reads on the primary
+for BLOG_PRIMARY_PIN_SECONDS after it writes, so replication lag never hides
+its own likes, comments or posts from it.
+"""
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+import dj_database_url
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+
+
+PRIMARY = 'default'
+REPLICA_ALIAS = 'replica_{index}'
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+# Always read on the primary. Sessions, users and permissions decide who a
+# request is, so a lagging replica could undo a sign-in, sign-out or password
+# change; the database cache backend holds the page generation, so it would
+# serve pages the last write retired.
+PRIMARY_APP_LABELS = {'auth', 'django_cache', 'sessions'}
+# Weight of the newest query in the per-replica moving average.
+LOAD_SMOOTHING = 0.2
+
+pinned_to_primary = ContextVar('blog_pinned_to_primary', default=False)
+
+
+def replica_databases(urls, **options):
+    """Parse a comma-separated DATABASE_REPLICA_URLS value into DATABASES entries."""
+    databases = {}
+    for index, url in enumerate(url.strip() for url in urls.split(',') if url.strip()):
+        config = dj_database_url.parse(url, **options)
+        # Tests run everything against the primary's test database.
+        config['TEST'] = {'MIRROR': PRIMARY}
+        databases[REPLICA_ALIAS.format(index=index)] = config
+    return databases
+
+
+class ReplicaLoad:
+    """Queries in flight and a moving average of query time per replica, in this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.average_ms = {}
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            with self.lock:
+                self.in_flight[alias] = self.in_flight.get(alias, 0) + 1
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with self.lock:
+                    self.in_flight[alias] -= 1
+                    average = self.average_ms.get(alias, elapsed_ms)
+                    self.average_ms[alias] = average + LOAD_SMOOTHING * (elapsed_ms - average)
+        return record
+
+    def least_loaded(self, aliases):
+        with self.lock:
+            return min(aliases, key=lambda alias: (
+                self.in_flight.get(alias, 0), self.average_ms.get(alias, 0.0), random.random()
+            ))
+
+    def reset(self):
+        with self.lock:
+            self.in_flight.clear()
+            self.average_ms.clear()
+
+
+replica_load = ReplicaLoad()
+
+
+def track_replica_load(sender, connection, **kwargs):
+    if connection.alias in settings.BLOG_REPLICA_DATABASES and not getattr(connection, 'replica_load_tracked', False):
+        connection.execute_wrappers.append(replica_load.wrapper(connection.alias))
+        connection.replica_load_tracked = True
+
+
+connection_created.connect(track_replica_load)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.BLOG_REPLICA_DATABASES
+        if not replicas or pinned_to_primary.get():
+            return PRIMARY
+        if model._meta.app_label in PRIMARY_APP_LABELS or model._meta.label == settings.AUTH_USER_MODEL:
+            return PRIMARY
+        if settings.BLOG_REPLICA_SELECTION == 'least_loaded':
+            return replica_load.least_loaded(replicas)
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class PrimaryPinningMiddleware:
+    """
+    Route every read of an unsafe request to the primary, and set a cookie
+    that does the same for the client's requests in the next
+    BLOG_PRIMARY_PIN_SECONDS. Removes itself when there are no replicas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.BLOG_REPLICA_DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = pinned_to_primary.set(self.should_pin(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            pinned_to_primary.reset(token)
+        return self.remember_write(request, response)
+
+    async def __acall__(self, request):
+        token = pinned_to_primary.set(self.should_pin(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            pinned_to_primary.reset(token)
+        return self.remember_write(request, response)
+
+    def should_pin(self, request):
+        return request.method in UNSAFE_METHODS or settings.BLOG_PRIMARY_PIN_COOKIE in request.COOKIES
+
+    def remember_write(self, request, response):
+        if request.method in UNSAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                settings.BLOG_PRIMARY_PIN_COOKIE, '1',
+                max_age=settings.BLOG_PRIMARY_PIN_SECONDS,
+                secure=request.is_secure(), httponly=True, samesite='Lax',
+            )
+        return response
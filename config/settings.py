@@ -2,6 +2,8 @@ from pathlib import Path
 import os
 import dj_database_url
 
+from config.db_router import replica_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -36,6 +38,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog_app.middleware.QueryInstrumentationMiddleware',
+    'config.db_router.PrimaryPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -47,9 +51,21 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Request profiling: QueryInstrumentationMiddleware records query counts, SQL time, repeated statements and view/template
+# time for a sample of requests. It unloads itself when disabled, and the profiled template backend is only installed
+# when it is on.
+BLOG_REQUEST_PROFILING = os.environ.get('DJANGO_REQUEST_PROFILING', 'False').lower() == 'true'
+BLOG_REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get('DJANGO_REQUEST_PROFILING_SAMPLE_RATE', '1.0'))
+BLOG_REQUEST_PROFILING_ALIAS = 'fragments'
+
+if BLOG_REQUEST_PROFILING:
+    TEMPLATE_BACKEND = 'blog_app.template_backends.ProfiledDjangoTemplates'
+else:
+    TEMPLATE_BACKEND = 'django.template.backends.django.DjangoTemplates'
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': TEMPLATE_BACKEND,
         'DIRS': [], # No project-level 'templates' directory specified
         'APP_DIRS': True,
         'OPTIONS': {
@@ -82,12 +98,129 @@ DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
     DATABASES['default'] = dj_database_url.config(
         default=DATABASE_URL,
-        conn_max_age=600,
+        # Use 0 under ASGI: async views run each request's queries in its own thread.
+        conn_max_age=int(os.environ.get('DJANGO_CONN_MAX_AGE', '600')),
         ssl_require=os.environ.get('DJANGO_DB_SSL_REQUIRE', 'False').lower() == 'true'
     )
 else: # Fallback for local development if DATABASE_URL is not set
     print("INFO: DATABASE_URL not set, using default local PostgreSQL settings from DATABASES dict.")
 
+# Read replicas: DATABASE_REPLICA_URLS is a comma-separated list of database URLs, added as replica_0, replica_1, ...
+# ReplicaRouter sends reads to them, picking one at random or the one with the fewest queries in flight
+# ('least_loaded'). A client's reads stay on the primary for DJANGO_PRIMARY_PIN_SECONDS after it writes.
+DATABASES.update(replica_databases(
+    os.environ.get('DATABASE_REPLICA_URLS', ''),
+    conn_max_age=int(os.environ.get('DJANGO_CONN_MAX_AGE', '600')),
+    ssl_require=os.environ.get('DJANGO_DB_SSL_REQUIRE', 'False').lower() == 'true'
+))
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+BLOG_REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+BLOG_REPLICA_SELECTION = os.environ.get('DJANGO_REPLICA_SELECTION', 'random').lower()
+BLOG_PRIMARY_PIN_SECONDS = int(os.environ.get('DJANGO_PRIMARY_PIN_SECONDS', '10'))
+BLOG_PRIMARY_PIN_COOKIE = 'pin_primary'
+
+# Connection pooling: DJANGO_DB_POOL=True gives every worker process a psycopg pool per database instead of
+# a connection per request (or one persistent connection per thread). Each pool keeps DJANGO_DB_POOL_MIN_SIZE
+# to DJANGO_DB_POOL_MAX_SIZE connections, so PostgreSQL sees at most workers x max size per database. A request
+# waits up to DJANGO_DB_POOL_TIMEOUT seconds for a free connection before failing, and connections are replaced
+# after DJANGO_DB_POOL_MAX_LIFETIME seconds. Pool usage is shown in the admin (Posts > Database pool stats).
+BLOG_DB_POOL = os.environ.get('DJANGO_DB_POOL', 'False').lower() == 'true'
+BLOG_DB_POOL_OPTIONS = {
+    'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX_SIZE', '10')),
+    'timeout': float(os.environ.get('DJANGO_DB_POOL_TIMEOUT', '10')),
+    'max_lifetime': float(os.environ.get('DJANGO_DB_POOL_MAX_LIFETIME', '1800')),
+}
+for database in DATABASES.values():
+    # Check a reused connection before handing it out; the server may have closed it. For persistent connections
+    # Django runs the check itself. For pooled ones it passes check=ConnectionPool.check_connection to the pool,
+    # which then checks each connection on checkout. That is why 'check' is not set in BLOG_DB_POOL_OPTIONS:
+    # Django always passes its own `check`, and a second one is a duplicate keyword argument.
+    database['CONN_HEALTH_CHECKS'] = True
+    if BLOG_DB_POOL:
+        # Pooled connections go back to the pool at the end of each request.
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = dict(BLOG_DB_POOL_OPTIONS)
+
+
+# Caches
+# The fragment cache holds rendered post cards and the page cache whole anonymous pages. Use locmem for tests and single-process
+# development; use 'file' or 'db' so that several workers share one cache.
+# - 'file': shared by the workers of one host (the Docker image's default). Cache generations are bumped only in the
+#   cache of the container that wrote, so with several containers point the *_CACHE_LOCATION settings at a shared
+#   volume or use 'db'.
+# - 'db': shared by every container, at a query per cache read on the primary database: an anonymous page hit costs two
+#   (generation and page), a page of post cards two (generation and one get_many), and each miss adds a count and an
+#   insert for the set. Needs `python manage.py createcachetable`.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+FRAGMENT_CACHE_BACKEND = os.environ.get('DJANGO_FRAGMENT_CACHE_BACKEND', 'locmem').lower()
+FRAGMENT_CACHE_LOCATIONS = {
+    'locmem': 'blog-fragments',
+    'file': str(BASE_DIR / 'cache' / 'fragments'),
+    'db': 'blog_fragment_cache',
+}
+PAGE_CACHE_LOCATIONS = {
+    'locmem': 'blog-pages',
+    'file': str(BASE_DIR / 'cache' / 'pages'),
+    'db': 'blog_page_cache',
+}
+SESSION_CACHE_LOCATIONS = {
+    'locmem': 'blog-sessions',
+    'file': str(BASE_DIR / 'cache' / 'sessions'),
+    'db': 'blog_session_cache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS['locmem'],
+    },
+    'fragments': {
+        'BACKEND': CACHE_BACKENDS[FRAGMENT_CACHE_BACKEND],
+        'LOCATION': os.environ.get('DJANGO_FRAGMENT_CACHE_LOCATION', FRAGMENT_CACHE_LOCATIONS[FRAGMENT_CACHE_BACKEND]),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'pages': {
+        'BACKEND': CACHE_BACKENDS[FRAGMENT_CACHE_BACKEND],
+        'LOCATION': os.environ.get('DJANGO_PAGE_CACHE_LOCATION', PAGE_CACHE_LOCATIONS[FRAGMENT_CACHE_BACKEND]),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Only used by DJANGO_SESSION_MODE=cached_db. Sized so sessions are not culled before their database write.
+    'sessions': {
+        'BACKEND': CACHE_BACKENDS[FRAGMENT_CACHE_BACKEND],
+        'LOCATION': os.environ.get('DJANGO_SESSION_CACHE_LOCATION', SESSION_CACHE_LOCATIONS[FRAGMENT_CACHE_BACKEND]),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+BLOG_CARD_CACHE_ENABLED = os.environ.get('DJANGO_CARD_CACHE_ENABLED', 'True').lower() == 'true'
+BLOG_CARD_CACHE_ALIAS = 'fragments'
+BLOG_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Whole-page cache for anonymous GET requests, invalidated by bumping a generation counter on writes.
+BLOG_PAGE_CACHE_ENABLED = os.environ.get('DJANGO_PAGE_CACHE_ENABLED', 'True').lower() == 'true'
+BLOG_PAGE_CACHE_ALIAS = 'pages'
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Sessions: DJANGO_SESSION_MODE picks the store. Every mode skips the save (and the Set-Cookie) when a request leaves
+# the session data as it was.
+# - 'db': rows in django_session, Django's default.
+# - 'cached_db': read from the 'sessions' cache; a change is written to the database at most once every
+#   DJANGO_SESSION_WRITE_BEHIND_SECONDS, except sign-in, sign-out and expiry changes which are written at once.
+#   Deferred changes exist only in the cache until written: on a per-process cache (locmem) they are lost when the
+#   worker restarts and invisible to other workers, so use the 'file' or 'db' cache backend with this mode.
+# - 'signed_cookies': the session lives in a signed (not encrypted) cookie and never touches the database.
+# `python manage.py purge_sessions` deletes expired database sessions in batches.
+BLOG_SESSION_MODE = os.environ.get('DJANGO_SESSION_MODE', 'db').lower()
+SESSION_ENGINE = f'blog_app.sessions.{BLOG_SESSION_MODE}'
+SESSION_CACHE_ALIAS = 'sessions'
+BLOG_SESSION_WRITE_BEHIND_SECONDS = int(os.environ.get('DJANGO_SESSION_WRITE_BEHIND_SECONDS', '300'))
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -119,16 +252,61 @@ STATIC_ROOT = BASE_DIR / 'staticfiles_collected'
 # you can uncomment and use STATICFILES_DIRS:
 # STATICFILES_DIRS = [BASE_DIR / "static_project_level"]
 
+# 'development' keeps Django's default static handling. 'production' makes
+# collectstatic write hashed names plus .gz/.br variants, and serves STATIC_URL
+# and MEDIA_URL through config.staticfiles.serve (see config/urls.py). With
+# DEBUG on, use `runserver --nostatic` or runserver answers /static/ itself.
+BLOG_STATIC_MODE = os.environ.get('DJANGO_STATIC_MODE', 'development').lower()
+if BLOG_STATIC_MODE == 'production':
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'config.staticfiles.CompressedManifestStaticFilesStorage'},
+    }
+# Cache lifetimes: hashed static names never change, everything else is revalidated.
+BLOG_STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+BLOG_STATIC_MAX_AGE = 60 * 60
+
 # Media files (user-uploaded content)
 MEDIA_URL = '/media/'
 # Directory where user-uploaded files will be stored on the server.
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
+# Profile image variants are generated off the request path by this many worker threads.
+BLOG_IMAGE_WORKERS = int(os.environ.get('DJANGO_IMAGE_WORKERS', '2'))
+
+# Route the read-heavy views (post list and detail, tag pages, search, profiles) to their async versions. Turn on when
+# serving through an ASGI worker (uvicorn, see the Dockerfile); under WSGI each async view costs an extra event loop hop.
+BLOG_ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS', 'False').lower() == 'true'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'blog_app.CustomUser'
 
+# Post search: 'fulltext' uses the PostgreSQL search vector on Post, 'basic' falls back to icontains lookups.
+BLOG_SEARCH_MODE = os.environ.get('DJANGO_SEARCH_MODE', 'fulltext').lower()
+
+# When enabled, like toggles append to the LikeEvent log instead of updating Post.like_count in place;
+# run `manage.py fold_like_events` periodically to fold the log into the stored counts.
+BLOG_LIKE_COUNT_BATCHING = os.environ.get('DJANGO_LIKE_COUNT_BATCHING', 'False').lower() == 'true'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog_app.performance': {
+            'handlers': ['console'],
+            'level': os.environ.get('DJANGO_PERFORMANCE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 LOGIN_URL = 'blog_app:login'
 LOGOUT_REDIRECT_URL = 'blog_app:post_list'
 LOGIN_REDIRECT_URL = 'blog_app:post_list'
\ No newline at end of file
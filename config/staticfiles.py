@@ -0,0 +1,196 @@
+"""
+Production static files: hashed names and precompressed variants from
+`collectstatic`, served in-process with long-lived cache headers.
+
+Enabled with DJANGO_STATIC_MODE=production (see BLOG_STATIC_MODE in settings).
+"""
+import gzip
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.xml', '.html', '.ico')
+MIN_COMPRESS_SIZE = 256
+# Preferred first; a variant is only offered if collectstatic wrote it.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes .gz and, when the brotli
+    package is installed, .br files next to every hashed text asset.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if not dry_run:
+            for hashed_name in sorted(hashed_names):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        path = Path(self.path(name))
+        data = path.read_bytes()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            # Not worth a second round trip through the decoder otherwise.
+            if len(compressed) < len(data):
+                path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def select_variant(fullpath, accept_encoding):
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if encoding in accepted or '*' in accepted:
+            variant = fullpath + suffix
+            if os.path.isfile(variant):
+                return variant, encoding
+    return fullpath, None
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single "bytes=" range, inclusive, None to serve
+    the whole file, or False if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        # Multiple ranges and other units are answered with the full body.
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+@require_safe
+def serve(request, path, document_root=None, immutable=True):
+    """
+    Serve a collected static (or media) file: the precompressed variant that
+    Accept-Encoding allows, 304 for a matching If-None-Match, 206/416 for a
+    single byte Range. Hashed names get a one year immutable lifetime; anything
+    else is revalidated after BLOG_STATIC_MAX_AGE seconds.
+    """
+    root = document_root or settings.STATIC_ROOT
+    try:
+        fullpath = safe_join(root, path)
+    except ValueError:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    filename, encoding = select_variant(fullpath, request.headers.get('Accept-Encoding', ''))
+    stat = os.stat(filename)
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{"-" + encoding if encoding else ""}"'
+
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Vary': 'Accept-Encoding',
+        'Accept-Ranges': 'bytes',
+    }
+    if immutable and HASHED_NAME_RE.search(path):
+        headers['Cache-Control'] = f'public, max-age={settings.BLOG_STATIC_IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        headers['Cache-Control'] = f'public, max-age={settings.BLOG_STATIC_MAX_AGE}'
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return _with_headers(HttpResponseNotModified(), headers)
+
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', etag) == etag:
+        byte_range = parse_range(range_header, stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+    elif byte_range is not None:
+        start, end = byte_range
+        with open(filename, 'rb') as file:
+            file.seek(start)
+            response = HttpResponse(file.read(end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        response = FileResponse(open(filename, 'rb'), content_type=content_type)
+        # FileResponse names the file it was given, which may be the .br/.gz variant.
+        response.headers.pop('Content-Disposition', None)
+
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return _with_headers(response, headers)
+
+
+def _with_headers(response, headers):
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _etag_matches(etag, if_none_match):
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison, as If-None-Match requires.
+    return etag in (tag.removeprefix('W/') for tag in parse_etags(if_none_match))
+
+
+def static_urlpatterns():
+    """Routes for STATIC_URL and MEDIA_URL when BLOG_STATIC_MODE is 'production'."""
+    return [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.STATIC_URL.lstrip('/')), serve),
+        # Uploads keep their names when replaced, so they are never immutable.
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve,
+                {'document_root': settings.MEDIA_ROOT, 'immutable': False}),
+    ]
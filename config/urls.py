@@ -19,9 +19,13 @@ from django.urls import path, include
 from blog_app.urls import urlpatterns as blog_app_urls
 from django.conf import settings
 from django.conf.urls.static import static
+from config.staticfiles import static_urlpatterns
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('blog_app/', include((blog_app_urls, 'blog_app'),namespace='blog_app'))
 ]
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.BLOG_STATIC_MODE == 'production':
+    urlpatterns += static_urlpatterns()
+else:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -6,6 +6,13 @@ echo "Waiting for PostgreSQL to be ready..."
 
 echo "Applying database migrations..."
 python manage.py migrate --noinput
+python manage.py createcachetable
+# Stored post stats are backfilled once by migration 0014. Stored bodies are
+# written by `python manage.py render_posts`, run as a one-off job after that
+# migration and after each RENDERER_VERSION bump; until then Post.body_html
+# renders stale posts on each read.
+
+# Static files are collected (hashed and compressed) when the image is built.
 
 echo "Starting server..."
 exec "$@"
\ No newline at end of file
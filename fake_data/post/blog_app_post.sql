@@ -1,100 +0,0 @@
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Elnora', false, '2024-06-21 18:15:59', '2024-08-11 06:36:40', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Ut enim ad minim veniam', 'Annamaria', true, '2024-11-07 21:56:40', '2024-07-06 14:31:29', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Lorem ipsum dolor sit amet', 'Raff', false, '2024-11-18 22:45:24', '2024-06-12 05:44:41', '2025-01-01 15:56:00');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Samson', false, '2025-01-26 13:00:10', '2024-10-01 21:40:31', '2025-01-11 07:36:51');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Lorem ipsum dolor sit amet', 'Kristian', true, '2025-03-28 15:14:24', '2024-08-27 04:31:20', '2024-05-28 01:36:59');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Ut enim ad minim veniam', 'Darryl', false, '2024-11-21 15:54:03', '2024-07-31 19:42:23', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Aline', true, '2025-04-25 06:14:46', '2024-06-03 23:13:28', '2025-04-13 11:13:23');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Ron', true, '2024-09-01 23:29:14', '2025-01-22 10:48:08', '2024-06-10 22:22:35');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'consectetur adipiscing elit.', 'Grata', false, '2024-09-02 04:40:28', '2024-12-14 06:38:28', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Lorem ipsum dolor sit amet', 'Gabbey', true, '2024-08-01 15:42:51', '2025-01-29 12:03:21', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Karilynn', true, '2024-07-25 21:06:04', '2025-02-22 09:09:39', '2025-05-07 14:07:46');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'consectetur adipiscing elit.', 'Melisenda', true, '2025-01-15 09:59:23', '2025-03-16 06:39:00', '2024-07-06 22:06:31');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Hobard', false, '2024-07-24 11:44:48', '2025-05-15 10:44:39', '2024-11-13 12:46:14');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Manon', true, '2024-09-29 08:51:13', '2025-04-10 17:02:27', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Randa', false, '2025-04-19 02:30:36', '2024-09-11 14:46:23', '2024-08-06 17:58:49');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Ethan', true, '2024-06-05 09:40:23', '2024-09-10 11:25:22', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Hobart', true, '2025-04-14 11:49:35', '2024-06-30 16:27:52', '2025-03-22 00:15:02');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Lorem ipsum dolor sit amet', 'Lonni', true, '2024-07-24 11:21:58', '2024-06-22 02:32:59', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'consectetur adipiscing elit.', 'Kania', true, '2024-09-09 07:22:25', '2025-04-16 06:11:51', '2024-08-24 16:43:38');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Rhianon', false, '2025-05-14 05:31:47', '2024-11-27 02:27:57', '2024-06-16 22:34:32');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Ut enim ad minim veniam', 'Henryetta', true, '2025-02-15 08:18:16', '2024-11-04 20:10:15', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Gannon', true, '2024-07-10 16:52:32', '2025-05-19 06:32:03', '2024-12-20 00:47:29');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Ut enim ad minim veniam', 'Rock', false, '2024-10-19 21:56:26', '2024-06-19 23:26:50', '2025-03-11 00:44:26');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'consectetur adipiscing elit.', 'Cele', true, '2024-11-13 14:11:13', '2024-06-13 11:16:56', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Lorem ipsum dolor sit amet', 'Janessa', true, '2025-05-03 19:14:04', '2025-01-09 18:45:39', '2024-06-27 04:08:41');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Chandra', false, '2025-01-13 07:37:26', '2024-10-26 12:52:04', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Dyanne', false, '2024-06-29 21:25:39', '2025-02-14 12:03:17', '2024-09-25 08:23:21');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'consectetur adipiscing elit.', 'Nerta', false, '2025-01-05 16:12:08', '2024-07-21 17:57:32', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Blondelle', false, '2024-12-31 14:23:57', '2025-02-14 10:42:48', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Ut enim ad minim veniam', 'Wilona', false, '2024-11-01 22:38:19', '2024-06-07 23:19:09', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Chaddy', true, '2025-02-09 05:04:16', '2025-01-16 09:47:47', '2024-11-29 07:55:00');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Jack', true, '2024-07-13 05:29:56', '2024-07-29 18:46:37', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Lorem ipsum dolor sit amet', 'Madalyn', false, '2024-06-23 00:57:33', '2025-01-21 05:45:17', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Ut enim ad minim veniam', 'Alisa', true, '2025-03-09 11:33:25', '2024-11-12 09:11:56', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Lorem ipsum dolor sit amet', 'Temple', false, '2025-03-17 09:21:35', '2024-06-23 16:28:16', '2024-09-11 03:15:44');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Jarad', false, '2024-06-27 18:05:40', '2025-04-29 03:05:52', '2024-07-20 08:50:35');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Gaby', true, '2024-08-08 01:44:40', '2024-07-17 00:05:54', '2025-05-02 00:19:03');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Veriee', true, '2024-05-29 01:15:43', '2024-09-19 16:48:31', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Danila', false, '2025-04-22 10:16:27', '2025-05-15 18:34:55', '2024-07-21 23:45:25');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Ciel', false, '2025-04-14 21:50:49', '2024-11-27 22:04:24', '2025-04-13 13:39:11');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Ut enim ad minim veniam', 'Carlene', true, '2024-07-01 00:49:56', '2024-06-24 19:04:10', '2025-03-21 14:47:13');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Ut enim ad minim veniam', 'Glynnis', false, '2024-09-12 00:57:41', '2024-10-23 09:39:10', '2024-12-23 13:00:15');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Lorem ipsum dolor sit amet', 'Moshe', true, '2024-09-24 21:49:17', '2024-06-06 10:02:04', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'consectetur adipiscing elit.', 'Godfrey', false, '2024-07-29 12:17:13', '2025-02-07 03:37:13', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Bili', false, '2024-06-18 00:57:35', '2024-08-22 08:54:36', '2024-08-14 09:30:04');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Ut enim ad minim veniam', 'Chantalle', false, '2024-05-21 16:01:45', '2024-06-22 17:39:51', '2024-11-21 17:52:34');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Ut enim ad minim veniam', 'Babb', true, '2024-08-02 17:00:00', '2025-03-11 12:48:21', '2025-02-09 10:37:33');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Ut enim ad minim veniam', 'Corri', true, '2024-12-29 12:31:23', '2024-07-29 05:08:39', '2025-05-15 01:22:39');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Ut enim ad minim veniam', 'Danika', false, '2025-02-24 15:55:17', '2024-07-10 07:50:55', '2024-06-15 14:57:49');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Salem', false, '2024-06-08 08:01:28', '2024-05-23 15:51:24', '2024-10-08 18:30:39');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'consectetur adipiscing elit.', 'Tory', false, '2024-11-01 07:13:13', '2025-04-12 10:46:28', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Kary', true, '2025-02-06 08:40:17', '2024-10-08 16:22:34', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'consectetur adipiscing elit.', 'Melisse', false, '2025-03-21 04:49:57', '2024-07-22 03:20:39', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Lorem ipsum dolor sit amet', 'Ludwig', false, '2024-10-29 21:04:08', '2024-06-21 14:23:43', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Hamish', false, '2024-08-31 12:11:08', '2024-07-08 08:09:48', '2025-02-15 20:18:53');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Timmie', false, '2024-10-27 18:31:11', '2024-11-24 23:33:16', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Ut enim ad minim veniam', 'Julissa', false, '2024-08-30 18:25:02', '2024-05-21 15:18:18', '2024-07-28 12:20:27');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Cordell', true, '2025-01-04 22:17:56', '2024-08-31 12:05:35', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Lorem ipsum dolor sit amet', 'Britt', false, '2024-07-16 16:53:33', '2025-04-28 03:36:14', '2024-10-01 18:20:26');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Leonidas', false, '2024-09-10 23:01:42', '2024-08-16 14:37:41', '2024-10-30 16:43:36');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Lorem ipsum dolor sit amet', 'Kris', true, '2024-11-12 02:02:57', '2025-01-26 18:15:43', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Ut enim ad minim veniam', 'Mair', true, '2025-01-18 19:37:55', '2024-11-14 07:02:15', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Lorem ipsum dolor sit amet', 'Philis', false, '2025-01-17 11:08:31', '2024-07-10 00:31:04', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Lorem ipsum dolor sit amet', 'Fairlie', true, '2024-09-04 13:38:34', '2024-08-31 16:46:50', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Ali', false, '2025-02-02 18:08:23', '2025-03-06 18:01:46', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'consectetur adipiscing elit.', 'Toddie', true, '2024-08-13 23:34:05', '2025-05-12 21:10:20', '2024-11-09 17:18:15');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Zolly', false, '2025-01-11 17:40:55', '2025-05-09 13:00:09', '2024-11-02 04:37:54');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Stanfield', true, '2025-02-28 21:33:56', '2024-08-06 03:41:46', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Anni', false, '2024-06-13 17:56:52', '2024-09-08 02:37:02', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Ut enim ad minim veniam', 'Frederique', true, '2025-02-02 02:11:09', '2024-10-27 17:14:28', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Clemmy', false, '2024-07-04 04:25:22', '2025-02-02 18:35:56', '2025-03-19 11:29:14');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'consectetur adipiscing elit.', 'Ashbey', true, '2025-02-27 23:09:17', '2024-07-17 03:57:04', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Ripley', false, '2025-04-10 07:39:23', '2025-04-11 15:17:24', '2025-04-19 13:45:08');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Raphaela', true, '2024-09-08 12:49:46', '2025-03-19 01:18:42', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'consectetur adipiscing elit.', 'Ianthe', true, '2024-10-27 01:58:29', '2025-02-12 01:24:48', '2024-11-17 07:08:42');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Zolly', false, '2025-04-05 07:21:33', '2024-05-29 01:05:47', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Lorem ipsum dolor sit amet', 'Dannie', false, '2024-09-26 06:07:57', '2024-06-14 17:45:07', '2024-06-14 20:58:57');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Ut enim ad minim veniam', 'Auberta', true, '2025-03-07 14:15:44', '2024-12-23 02:49:32', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Titos', true, '2024-09-04 09:23:55', '2024-12-06 04:35:26', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Mohandas', true, '2025-01-07 20:53:07', '2024-09-26 10:22:53', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Langston', true, '2025-05-18 06:32:25', '2024-07-09 13:51:43', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Lorem ipsum dolor sit amet', 'Brandise', false, '2024-09-24 16:35:58', '2024-12-31 15:27:33', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Ut enim ad minim veniam', 'Joleen', true, '2025-01-17 23:54:47', '2024-11-24 08:50:34', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Lorem ipsum dolor sit amet', 'Millisent', false, '2024-05-24 07:13:46', '2024-10-13 12:39:27', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Hewett', false, '2024-11-29 12:36:17', '2024-08-19 08:15:13', '2024-11-18 02:12:40');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Ut enim ad minim veniam', 'Simone', true, '2024-07-11 01:48:23', '2025-02-18 11:58:32', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'consectetur adipiscing elit.', 'Micki', true, '2024-08-15 13:21:56', '2024-10-13 00:47:04', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Farlay', false, '2024-10-09 07:30:00', '2024-08-04 21:22:34', '2024-07-12 07:37:28');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Myles', false, '2025-04-06 08:07:29', '2025-03-11 19:39:00', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'consectetur adipiscing elit.', 'Dorene', true, '2024-12-06 17:38:18', '2025-03-08 08:04:35', '2024-06-11 02:07:30');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Top 10 Tips for Productivity', 'Lorem ipsum dolor sit amet', 'Yule', true, '2024-12-23 00:47:27', '2024-11-03 19:42:51', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Holly', false, '2024-11-16 18:59:37', '2024-10-26 08:59:35', '2025-03-02 20:37:01');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Rudolfo', false, '2024-07-08 05:55:53', '2024-06-27 21:36:10', '2024-07-27 21:08:21');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Gherardo', false, '2024-07-09 00:41:01', '2025-01-25 04:55:10', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Lorem ipsum dolor sit amet', 'Robby', false, '2024-11-03 20:06:52', '2025-01-05 10:40:26', '2025-04-08 16:45:31');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Ultimate Guide to Healthy Eating', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Silvio', true, '2024-12-02 15:37:37', '2025-01-25 08:08:13', '2024-06-17 17:21:37');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.', 'Parrnell', false, '2025-01-04 07:12:42', '2024-11-14 20:08:27', '2025-01-23 13:37:49');
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('Exploring the Wonders of Nature', 'Lorem ipsum dolor sit amet', 'Anett', true, '2025-05-09 11:41:14', '2024-12-08 11:16:47', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('10 Ways to Improve Your Photography Skills', 'consectetur adipiscing elit.', 'Sile', true, '2025-02-02 12:21:05', '2024-09-02 23:05:17', null);
-insert into blog_app_post (title, content, author, is_published, created_at, updated_at, deleted_at) values ('The Art of Mindfulness: Finding Inner Peace', 'quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.', 'Benson', true, '2025-01-23 12:14:46', '2024-12-15 04:41:35', '2024-12-23 16:53:48');